@@ -0,0 +1,20 @@
+"""add (created_at, id) index for keyset pagination
+
+Revision ID: 7c1f3a9e4b20
+Revises: 25d814bc83ed
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = '7c1f3a9e4b20'
+down_revision = '25d814bc83ed'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,29 @@
+"""add trigram and prefix search indexes on nickname and email
+
+Revision ID: b4e2d8f61c37
+Revises: 7c1f3a9e4b20
+Create Date: 2026-10-18 11:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = 'b4e2d8f61c37'
+down_revision = '7c1f3a9e4b20'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN trigram indexes serve substring searches (ILIKE '%x%')
+    op.create_index('ix_users_nickname_trgm', 'users', ['nickname'], postgresql_using='gin', postgresql_ops={'nickname': 'gin_trgm_ops'})
+    op.create_index('ix_users_email_trgm', 'users', ['email'], postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+    # Pattern-ops indexes serve case-insensitive prefix searches (lower(col) LIKE 'x%')
+    op.execute("CREATE INDEX ix_users_nickname_lower_prefix ON users (lower(nickname) text_pattern_ops)")
+    op.execute("CREATE INDEX ix_users_email_lower_prefix ON users (lower(email) text_pattern_ops)")
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower_prefix', table_name='users')
+    op.drop_index('ix_users_nickname_lower_prefix', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_users_nickname_trgm', table_name='users')
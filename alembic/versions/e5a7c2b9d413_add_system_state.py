@@ -0,0 +1,30 @@
+"""add system_state table with the admin bootstrap flag
+
+Revision ID: e5a7c2b9d413
+Revises: d91a5c3e7f08
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'e5a7c2b9d413'
+down_revision = 'd91a5c3e7f08'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'system_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('admin_bootstrapped', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('id = 1', name='ck_system_state_single_row'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Existing installations already have their first user
+    op.execute("INSERT INTO system_state (id, admin_bootstrapped) SELECT 1, EXISTS (SELECT 1 FROM users)")
+
+def downgrade() -> None:
+    op.drop_table('system_state')
@@ -1,17 +1,82 @@
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+from sqlalchemy import MetaData, event, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.utils.metrics import REGISTRY, Histogram, HistogramFamily
 Base = declarative_base()
 
+query_time = HistogramFamily(
+    "db_query_duration_seconds",
+    "Time the database took to execute a statement, by statement type.",
+    ("operation",),
+    registry=REGISTRY,
+)
+# Statement types with their own label value; anything else (BEGIN, WITH, DDL) is "other"
+QUERY_OPERATIONS = frozenset(("select", "insert", "update", "delete"))
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    operation = statement.lstrip()[:6].lower()
+    query_time.labels(operation if operation in QUERY_OPERATIONS else "other").observe(elapsed)
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to check out a connection."""
+    wait_time = Histogram()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
 class Database:
     """Handles database connections and sessions."""
     _engine = None
     _session_factory = None
+    _pool_capacity = None  # pool_size + max_overflow; None for SQLite
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
+    def initialize(
+        cls,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+    ):
         """Initialize the async engine and sessionmaker."""
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            pool_options = {}
+            if not database_url.startswith("sqlite"):  # SQLite uses its own single-connection pools
+                pool_options = dict(
+                    poolclass=InstrumentedAsyncQueuePool,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_timeout=pool_timeout,
+                    pool_recycle=pool_recycle,
+                    pool_pre_ping=pool_pre_ping,
+                )
+                cls._pool_capacity = pool_size + max_overflow
+            cls._engine = create_async_engine(database_url, echo=echo, future=True, **pool_options)
+            # Times every statement, so DB time can be told apart from hashing and SMTP
+            event.listen(cls._engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(cls._engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(cls._engine.sync_engine, "handle_error", _handle_error)
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
@@ -21,4 +86,75 @@ class Database:
         """Returns the session factory, ensuring it's initialized."""
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
-        return cls._session_factory
\ No newline at end of file
+        return cls._session_factory
+
+    @classmethod
+    async def warm_up(cls, connections: int):
+        """
+        Open `connections` pooled connections now, so the first requests do not pay for
+        connecting. They are returned to the pool, which keeps up to `pool_size` open.
+        """
+        engine = cls._get_engine()
+        async with AsyncExitStack() as stack:
+            # Hold them all at once; releasing each before the next would reuse one connection
+            for _ in range(connections):
+                conn = await stack.enter_async_context(engine.connect())
+                await conn.execute(text("SELECT 1"))
+
+    @classmethod
+    async def missing_schema(cls, metadata: MetaData) -> List[str]:
+        """Return the tables and columns in `metadata` that the database lacks ("table" or "table.column")."""
+        def find_missing(sync_conn) -> List[str]:
+            inspector = inspect(sync_conn)
+            existing_tables = set(inspector.get_table_names())
+            missing = []
+            for table in metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    missing.append(table.name)
+                    continue
+                existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+                missing.extend(f"{table.name}.{column.name}" for column in table.columns if column.name not in existing_columns)
+            return missing
+
+        async with cls._get_engine().connect() as conn:
+            return await conn.run_sync(find_missing)
+
+    @classmethod
+    async def dispose(cls):
+        """Close all pooled connections and forget the engine; `initialize` may be called again."""
+        if cls._engine is not None:
+            await cls._engine.dispose()
+            cls._engine = None
+            cls._session_factory = None
+            cls._pool_capacity = None
+
+    @classmethod
+    def pool_usage(cls) -> Optional[float]:
+        """Fraction of the pool's connections (including overflow) checked out, or None without a queue pool."""
+        pool = cls._get_engine().pool
+        if cls._pool_capacity is None or not isinstance(pool, InstrumentedAsyncQueuePool):
+            return None
+        return pool.checkedout() / cls._pool_capacity
+
+    @classmethod
+    def _get_engine(cls):
+        if cls._engine is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        return cls._engine
+
+    @classmethod
+    def pool_status(cls) -> Dict:
+        """Returns a snapshot of connection pool usage for the metrics endpoint."""
+        if cls._engine is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        pool = cls._engine.pool
+        if not isinstance(pool, InstrumentedAsyncQueuePool):
+            return {"pool_class": type(pool).__name__}
+        return {
+            "pool_class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "wait_seconds": pool.wait_time.snapshot(),
+        }
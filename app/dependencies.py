@@ -1,22 +1,105 @@
-from builtins import Exception, dict, str
-from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from builtins import Exception, dict, frozenset, isinstance, min, str
+import math
+import secrets
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import Database
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
-from app.services.jwt_service import decode_token
-from settings.config import Settings
+from app.services.user_cache_service import UserCache
+from app.utils.cache import create_cache_backend
+from app.utils.rate_limit import RateLimiter, create_rate_limiter
+from app.services import jwt_service
+from settings.config import Settings, settings
 from fastapi import Depends
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
 
 def get_settings() -> Settings:
-    """Return application settings."""
-    return Settings()
+    """Return the process-wide application settings (loaded once at import)."""
+    return settings
+
+_email_service: Optional[EmailService] = None
 
 def get_email_service() -> EmailService:
-    template_manager = TemplateManager()
-    return EmailService(template_manager=template_manager)
+    """Return the process-wide email service, so SMTP connections are reused across requests."""
+    global _email_service
+    if _email_service is None:
+        _email_service = EmailService(template_manager=TemplateManager(auto_reload=settings.debug))
+    return _email_service
+
+def close_email_service():
+    """Close the shared email service's SMTP connections, if it was created."""
+    global _email_service
+    if _email_service is not None:
+        _email_service.close()
+        _email_service = None
+
+_user_cache: Optional[UserCache] = None
+
+def get_user_cache() -> Optional[UserCache]:
+    """
+    Return the process-wide user lookup cache, or None when caching is disabled.
+
+    The 'memory' backend only invalidates entries in this process, so its TTL is capped at
+    `user_cache_memory_ttl` to bound how long other workers serve a changed user.
+    """
+    global _user_cache
+    if _user_cache is None:
+        ttl = settings.user_cache_ttl
+        if settings.user_cache_backend == "memory":
+            ttl = min(ttl, settings.user_cache_memory_ttl)
+        backend = create_cache_backend(
+            settings.user_cache_backend,
+            max_size=settings.user_cache_max_size,
+            ttl=ttl,
+            redis_url=settings.user_cache_redis_url,
+        )
+        if backend is not None:
+            _user_cache = UserCache(backend)
+    return _user_cache
+
+_login_rate_limiters: Optional[Tuple[Optional[RateLimiter], Optional[RateLimiter]]] = None
+
+def get_login_rate_limiters() -> Tuple[Optional[RateLimiter], Optional[RateLimiter]]:
+    """Return the process-wide login limiters keyed by client IP and by email (None when disabled)."""
+    global _login_rate_limiters
+    if _login_rate_limiters is None:
+        _login_rate_limiters = tuple(
+            create_rate_limiter(
+                settings.login_rate_limit_backend,
+                limit=limit,
+                window=settings.login_rate_limit_window,
+                max_keys=settings.login_rate_limit_max_keys,
+                redis_url=settings.login_rate_limit_redis_url,
+                prefix=prefix,
+            )
+            for limit, prefix in (
+                (settings.login_rate_limit_per_ip, "login-ip:"),
+                (settings.login_rate_limit_per_email, "login-email:"),
+            )
+        )
+    return _login_rate_limiters
+
+async def limit_login_attempts(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    Reject login attempts over the per-IP or per-email limit with 429 and `Retry-After`.
+
+    Runs before the login handler, so throttled attempts cost no database query or bcrypt
+    check. Every attempt counts, successful or not. The IP is the one uvicorn reports,
+    so behind a proxy uvicorn must trust its forwarded headers.
+    """
+    ip_limiter, email_limiter = get_login_rate_limiters()
+    for limiter, key in ((ip_limiter, request.client.host if request.client else "unknown"), (email_limiter, form_data.username.strip().lower())):
+        if limiter is None:
+            continue
+        retry_after = await limiter.hit(key)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many login attempts. Try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session for each request."""
@@ -30,13 +113,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/")
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    Identify the caller from the bearer token alone, without a database query.
+
+    Tokens verified before are served from `jwt_service.token_cache` until they expire.
+    Declared `async` so it runs on the event loop rather than taking a thread pool hop.
+    """
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = decode_token(token)
+    payload = jwt_service.decode_token_cached(token)
     if payload is None:
         raise credentials_exception
     user_id: str = payload.get("sub")
@@ -45,9 +134,35 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return {"user_id": user_id, "role": user_role}
 
-def require_role(role: str):
-    def role_checker(current_user: dict = Depends(get_current_user)):
-        if current_user["role"] not in role:
-            raise HTTPException(status_code=403, detail="Operation not permitted")
-        return current_user
-    return role_checker
\ No newline at end of file
+async def require_metrics_access(token: str = Depends(oauth2_scheme)):
+    """
+    Allow the monitoring endpoints to ADMIN users and to scrapers presenting `metrics_token`.
+
+    A scraper cannot refresh short-lived access tokens, so a static token can be configured
+    for it instead.
+    """
+    if settings.metrics_token and secrets.compare_digest(token.encode(), settings.metrics_token.encode()):
+        return None
+    current_user = await get_current_user(token)
+    if current_user["role"] != "ADMIN":
+        raise HTTPException(status_code=403, detail="Operation not permitted")
+    return current_user
+
+_role_checkers: Dict[FrozenSet[str], Callable] = {}
+
+def require_role(role: Iterable[str]):
+    """
+    Return a dependency that allows only the given roles.
+
+    The allowed roles are compiled into a frozenset once, and routes allowing the same roles
+    share one checker, so FastAPI resolves it once per request.
+    """
+    allowed_roles = frozenset([role] if isinstance(role, str) else role)
+    role_checker = _role_checkers.get(allowed_roles)
+    if role_checker is None:
+        async def role_checker(current_user: dict = Depends(get_current_user)):
+            if current_user["role"] not in allowed_roles:
+                raise HTTPException(status_code=403, detail="Operation not permitted")
+            return current_user
+        _role_checkers[allowed_roles] = role_checker
+    return role_checker
@@ -1,12 +1,112 @@
-from builtins import Exception
+from builtins import Exception, RuntimeError, min
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
-from app.database import Database
-from app.dependencies import get_settings
-from app.routers import user_routes
-from app.utils.common import setup_logging
+from app.database import Base, Database
+from app.dependencies import close_email_service, get_email_service, get_settings
+from app.routers import health_routes, jwks_routes, metrics_routes, user_routes
+from app.services.email_outbox_service import EmailOutboxWorker
+from app.services.jwt_service import get_key_ring
+from app.services.signing_key_service import KeyRotationWorker
+from app.utils.common import setup_logging, shutdown_logging
 from app.utils.api_description import getDescription
+from app.utils.request_metrics import RequestMetricsMiddleware
+from app.utils.structured_logging import RequestIdMiddleware
+from app.utils.security import shutdown_hash_executor
+
+logger = logging.getLogger(__name__)
+
+async def warm_up(app: FastAPI):
+    """
+    Get this worker ready to serve at full speed, then set `app.state.ready`.
+
+    Compiles the email templates, loads the JWT signing keys, checks that the database has
+    every table and column the models use, and opens `db_warmup_connections` pool
+    connections. Raises if the database is unreachable or not migrated.
+    """
+    settings = get_settings()
+    get_email_service().template_manager.preload()
+    key_ring = get_key_ring()
+    if key_ring is not None:
+        await asyncio.to_thread(key_ring.signing_key)
+    if settings.db_check_schema:
+        missing = await Database.missing_schema(Base.metadata)
+        if missing:
+            raise RuntimeError(f"Database schema is missing {', '.join(missing)}; run the migrations")
+    await Database.warm_up(min(settings.db_warmup_connections, settings.db_pool_size))
+    app.state.ready = True
+    logger.info("Warmup complete; ready to serve")
+
+async def retry_warm_up(app: FastAPI):
+    """Repeat `warm_up` every `warmup_retry_interval` seconds until it succeeds."""
+    while True:
+        await asyncio.sleep(get_settings().warmup_retry_interval)
+        try:
+            await warm_up(app)
+            return
+        except Exception as e:
+            logger.error("Warmup failed, retrying: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    setup_logging()
+    Database.initialize(
+        settings.database_url,
+        settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    # Unready until warmed up, so the first requests routed here find warm pools and templates
+    app.state.ready = False
+    warmup_task = None
+    try:
+        await warm_up(app)
+    except Exception as e:
+        # Keep booting (a database outage should not crash the worker), but stay unready
+        logger.error("Warmup failed, retrying in the background: %s", e)
+        warmup_task = asyncio.create_task(retry_warm_up(app))
+
+    email_outbox_worker = EmailOutboxWorker(
+        get_email_service(),
+        Database.get_session_factory(),
+        max_attempts=settings.email_outbox_max_attempts,
+        base_delay=settings.email_outbox_base_delay,
+        max_delay=settings.email_outbox_max_delay,
+        poll_interval=settings.email_outbox_poll_interval,
+        batch_size=settings.email_outbox_batch_size,
+        lease=settings.email_outbox_lease,
+    )
+    email_outbox_worker.start()
+    # Signing keys are rotated in the background; HS256 has no keys to rotate
+    key_ring = get_key_ring()
+    key_rotation_worker = None
+    if key_ring is not None:
+        key_rotation_worker = KeyRotationWorker(key_ring, check_interval=settings.jwt_key_check_interval)
+        key_rotation_worker.start()
+
+    yield
+
+    # The server has stopped accepting requests and finished the in-flight ones by now
+    app.state.ready = False
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await email_outbox_worker.stop(timeout=settings.shutdown_timeout)
+    if key_rotation_worker is not None:
+        await key_rotation_worker.stop()
+    # Waits for queued password hashes, off the event loop
+    await asyncio.to_thread(shutdown_hash_executor)
+    close_email_service()
+    await Database.dispose()
+    logger.info("Shutdown complete")
+    shutdown_logging()
+
 app = FastAPI(
     title="User Management",
     description=getDescription(),
@@ -17,6 +117,7 @@ app = FastAPI(
         "email": "support@example.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
 )
 # CORS middleware configuration
 # This middleware will enable CORS and allow requests from any origin
@@ -29,13 +130,17 @@ app.add_middleware(
     allow_headers=["*"],  # Allowed HTTP headers
 )
 
-@app.on_event("startup")
-async def startup_event():
-    settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
-    setup_logging()
+# Added after CORS so it wraps it and times the whole request
+if get_settings().request_metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+# Outermost, so everything logged while handling a request carries its id
+app.add_middleware(RequestIdMiddleware)
+
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(jwks_routes.router)
+app.include_router(health_routes.router)
@@ -0,0 +1,55 @@
+from builtins import int, str
+from datetime import datetime
+from enum import Enum
+import uuid
+from sqlalchemy import (
+    JSON, Column, String, Integer, DateTime, Index, func, Enum as SQLAlchemyEnum
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class OutboxStatus(Enum):
+    """Delivery state of an outbox entry."""
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class EmailOutbox(Base):
+    """
+    Durable record of an email waiting to be delivered, corresponding to the 'email_outbox' table.
+
+    Entries are written in the same transaction as the change that triggers them, and a
+    background worker delivers them, retrying with exponential backoff until `max_attempts`.
+
+    Attributes:
+        id (UUID): Unique identifier for the entry.
+        email_type (str): Template name passed to `EmailService.send_user_email`.
+        recipient (str): Email address the message is sent to.
+        payload (dict): Template context, including the recipient's `email`.
+        status (OutboxStatus): PENDING until sent, FAILED once attempts are exhausted.
+        attempts (int): Number of delivery attempts made so far.
+        next_attempt_at (datetime): Earliest time the next attempt may run.
+        last_error (str): Error message from the most recent failed attempt.
+        created_at (datetime): Timestamp when the entry was queued.
+        sent_at (datetime): Timestamp when the email was delivered.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Serves the worker's "due pending entries" scan
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email_type: Mapped[str] = Column(String(50), nullable=False)
+    recipient: Mapped[str] = Column(String(255), nullable=False)
+    payload: Mapped[dict] = Column(JSON, nullable=False)
+    status: Mapped[OutboxStatus] = Column(SQLAlchemyEnum(OutboxStatus, name='OutboxStatus', create_constraint=True), nullable=False, default=OutboxStatus.PENDING)
+    attempts: Mapped[int] = Column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error: Mapped[str] = Column(String(500), nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<EmailOutbox {self.email_type} to {self.recipient}, Status: {self.status.name}>"
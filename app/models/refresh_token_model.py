@@ -0,0 +1,43 @@
+from builtins import str
+from datetime import datetime
+import uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class RefreshToken(Base):
+    """
+    A refresh token issued at login, corresponding to the 'refresh_tokens' table.
+
+    Only the SHA-256 digest of the token is stored. Every refresh revokes the presented
+    token and issues its replacement in the same family; presenting a revoked token again
+    means it was copied, so the whole family is revoked.
+
+    Attributes:
+        id (UUID): Unique identifier for the token.
+        user_id (UUID): The user the token authenticates.
+        family_id (UUID): Shared by a login's token and all tokens rotated from it.
+        token_hash (str): Hex SHA-256 digest of the token.
+        expires_at (datetime): Time after which the token is rejected.
+        created_at (datetime): Timestamp when the token was issued.
+        revoked_at (datetime): Timestamp when the token was rotated or revoked.
+        replaced_by (UUID): The token issued when this one was rotated.
+    """
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_user_id", "user_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=False)
+    token_hash: Mapped[str] = Column(String(64), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    revoked_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    replaced_by: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken {self.id} for user {self.user_id}>"
@@ -0,0 +1,37 @@
+from builtins import bool, int, str
+from datetime import datetime
+from sqlalchemy import DDL, Column, Boolean, CheckConstraint, DateTime, Integer, event, func
+from sqlalchemy.orm import Mapped
+from app.database import Base
+
+# Primary key of the only row in 'system_state'
+SYSTEM_STATE_ID = 1
+
+class SystemState(Base):
+    """
+    Application-wide state, stored as a single row in the 'system_state' table.
+
+    Attributes:
+        id (int): Always `SYSTEM_STATE_ID`; the check constraint keeps the table to one row.
+        admin_bootstrapped (bool): Set once the first user has been granted ADMIN. Claiming it
+            with a conditional UPDATE makes the first-admin decision O(1) and race-free.
+        updated_at (datetime): Timestamp of the last change.
+    """
+    __tablename__ = "system_state"
+    __table_args__ = (
+        CheckConstraint(f"id = {SYSTEM_STATE_ID}", name="ck_system_state_single_row"),
+    )
+
+    id: Mapped[int] = Column(Integer, primary_key=True, default=SYSTEM_STATE_ID)
+    admin_bootstrapped: Mapped[bool] = Column(Boolean, nullable=False, default=False)
+    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<SystemState admin_bootstrapped={self.admin_bootstrapped}>"
+
+# The row must exist for the bootstrap flag to be claimed
+event.listen(
+    SystemState.__table__,
+    "after_create",
+    DDL(f"INSERT INTO system_state (id, admin_bootstrapped) VALUES ({SYSTEM_STATE_ID}, false)"),
+)
@@ -5,7 +5,7 @@ from enum import Enum
 import uuid
 import random
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    DDL, Column, String, Integer, DateTime, Boolean, Index, event, func, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
@@ -53,6 +53,13 @@ class User(Base):
         update_professional_status(status): Updates the professional status and logs the update time.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Supports keyset pagination ordered by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Trigram indexes serve substring (ILIKE '%x%') searches on nickname and email
+        Index("ix_users_nickname_trgm", "nickname", postgresql_using="gin", postgresql_ops={"nickname": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
     __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -100,3 +107,10 @@ class User(Base):
 
     def anonymize(self):
         self.nickname = f"Anonymous{random.randint(1, 9999)}"
+
+# Pattern-ops indexes serve case-insensitive prefix (lower(col) LIKE 'x%') searches
+Index("ix_users_nickname_lower_prefix", func.lower(User.nickname).label("nickname_lower"), postgresql_ops={"nickname_lower": "text_pattern_ops"})
+Index("ix_users_email_lower_prefix", func.lower(User.email).label("email_lower"), postgresql_ops={"email_lower": "text_pattern_ops"})
+
+# The trigram operator classes come from the pg_trgm extension
+event.listen(User.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
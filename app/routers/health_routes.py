@@ -0,0 +1,33 @@
+"""
+Liveness and readiness probes for load balancers and orchestrators.
+"""
+
+from fastapi import APIRouter, Request, status
+from starlette.responses import JSONResponse
+from app.services.health_service import HealthService
+
+router = APIRouter()
+
+@router.get("/healthz", name="liveness", tags=["Monitoring"])
+async def liveness():
+    """
+    Report that the process is up and serving requests.
+
+    Performs no I/O, so it stays fast under load; use it to decide whether to restart the
+    process, not whether to route traffic to it.
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz", name="readiness", tags=["Monitoring"])
+async def readiness(request: Request):
+    """
+    Report whether this worker should receive traffic: 200 when ready, 503 otherwise.
+
+    Checks that startup warmup finished, that the connection pool is not saturated, and
+    that the database answers (a cached ping that also reports the pending email count).
+    """
+    ready, checks = await HealthService.readiness(getattr(request.app.state, "ready", False))
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "unready", "checks": checks},
+    )
@@ -0,0 +1,29 @@
+"""
+Public signing keys, so other services can verify access tokens without calling this one.
+"""
+
+import hashlib
+import json
+from fastapi import APIRouter, Request, Response
+from app.services.jwt_service import get_key_ring
+from settings.config import settings
+
+router = APIRouter()
+
+@router.get("/.well-known/jwks.json", name="jwks", tags=["Login and Registration"])
+async def jwks(request: Request):
+    """
+    Return the public keys that verify access tokens, as a JWK Set (RFC 7517).
+
+    Match a token's `kid` header to a key. Responses may be cached for `jwks_max_age`
+    seconds: a new key is listed here at least that long before any token is signed with
+    it. Send the `ETag` back in `If-None-Match` to get a 304 when nothing changed. The set
+    is empty when tokens are signed with a shared secret.
+    """
+    key_ring = get_key_ring()
+    body = json.dumps(key_ring.jwks() if key_ring is not None else {"keys": []}, sort_keys=True)
+    etag = '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+    headers = {"Cache-Control": f"public, max-age={settings.jwks_max_age}", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/jwk-set+json", headers=headers)
@@ -0,0 +1,82 @@
+"""
+Operational metrics endpoints used for capacity planning and monitoring.
+
+All of them require an ADMIN access token or the configured `metrics_token`.
+"""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.database import Database
+from app.dependencies import get_user_cache, require_metrics_access
+from app.services.jwt_service import auth_time, token_cache
+from app.utils.metrics import REGISTRY, metric_header, sample_lines
+
+router = APIRouter(dependencies=[Depends(require_metrics_access)])
+
+# Content type of the Prometheus text exposition format; the response adds the charset
+EXPOSITION_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+def collect_operational_metrics() -> List[str]:
+    """The pool, user cache and auth figures of the JSON endpoints below, as exposition lines."""
+    lines = []
+    pool = Database.pool_status()
+    if "size" in pool:
+        lines += sample_lines("db_pool_size", "Connections kept open in the pool.", "gauge", pool["size"])
+        lines += sample_lines("db_pool_checked_out", "Pool connections in use.", "gauge", pool["checked_out"])
+        lines += sample_lines("db_pool_overflow", "Connections open above the pool size.", "gauge", pool["overflow"])
+        lines += metric_header("db_pool_wait_seconds", "Time spent waiting to check out a connection.", "histogram")
+        lines += Database._get_engine().pool.wait_time.samples("db_pool_wait_seconds")
+    user_cache = get_user_cache()
+    if user_cache is not None:
+        lines += sample_lines("user_cache_hits_total", "User lookups served from the cache.", "counter", user_cache.hits)
+        lines += sample_lines("user_cache_misses_total", "User lookups that went to the database.", "counter", user_cache.misses)
+    lines += sample_lines("auth_token_cache_hits_total", "Access tokens found already verified.", "counter", token_cache.hits)
+    lines += sample_lines("auth_token_cache_misses_total", "Access tokens verified from scratch.", "counter", token_cache.misses)
+    lines += metric_header("auth_duration_seconds", "Time spent authenticating a request's bearer token.", "histogram")
+    lines += auth_time.samples("auth_duration_seconds")
+    return lines
+
+REGISTRY.register_collector(collect_operational_metrics)
+
+@router.get("/metrics", name="prometheus_metrics", tags=["Monitoring"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Report all metrics of this worker process in the Prometheus text exposition format.
+
+    Includes per-route request latency and status codes, requests in flight, database
+    statement, password hashing and email send times, and the pool, user cache and auth
+    figures of the endpoints below.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=EXPOSITION_CONTENT_TYPE)
+
+@router.get("/metrics/db-pool", name="db_pool_metrics", tags=["Monitoring"])
+async def db_pool_metrics():
+    """
+    Report database connection pool usage for this worker process.
+
+    Includes pool size, checked-out and overflow connections, and a histogram of the
+    time requests spent waiting to check out a connection.
+    """
+    return Database.pool_status()
+
+@router.get("/metrics/user-cache", name="user_cache_metrics", tags=["Monitoring"])
+async def user_cache_metrics():
+    """
+    Report user lookup cache effectiveness for this worker process.
+
+    Includes the backend, the number of cached entries (in-process cache only), and the
+    hit and miss counts of lookups by id, email and nickname.
+    """
+    user_cache = get_user_cache()
+    return user_cache.stats() if user_cache is not None else {"backend": None}
+
+@router.get("/metrics/auth", name="auth_metrics", tags=["Monitoring"])
+async def auth_metrics():
+    """
+    Report bearer-token authentication cost for this worker process.
+
+    Includes the verified-token cache hit and miss counts and a histogram of the time
+    spent authenticating each request's token.
+    """
+    return {"token_cache": token_cache.stats(), "auth_time_seconds": auth_time.snapshot()}
@@ -20,27 +20,31 @@ Key Highlights:
 """
 
 from builtins import dict, int, len, str
+import csv
+import io
 from datetime import timedelta
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request, Query
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Response, status, Request, Query, UploadFile
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.dependencies import get_current_user, get_db, get_email_service, limit_login_attempts, require_role
 from app.schemas.pagination_schema import EnhancedPagination
-from app.schemas.token_schema import TokenResponse
+from app.schemas.token_schema import RefreshTokenRequest, TokenResponse
 from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
 from app.services.user_service import UserService
+from app.services.refresh_token_service import RefreshTokenService
 from app.services.jwt_service import create_access_token
 from app.utils.link_generation import create_user_links, generate_pagination_links
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from app.models.user_model import UserRole
 from datetime import datetime
 from app.utils.pagination import generate_pagination_links
 from app.schemas.user_schemas import UpdateProfilePictureRequest
 import logging
 from app.schemas.user_schemas import UpdateBioRequest
+from app.schemas.user_schemas import UserImportResponse
 
 
 router = APIRouter()
@@ -195,22 +199,80 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     )
 
 
+async def _import_users(db: AsyncSession, rows: List[Dict[str, Any]], email_service: EmailService) -> UserImportResponse:
+    if len(rows) > settings.user_import_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Imports are limited to {settings.user_import_max_rows} rows"
+        )
+    results = await UserService.bulk_import(db, rows, email_service, chunk_size=settings.user_import_chunk_size)
+    statuses = [result["status"] for result in results]
+    return UserImportResponse(
+        created=statuses.count("created"),
+        duplicates=statuses.count("duplicate"),
+        invalid=statuses.count("invalid"),
+        errors=statuses.count("error"),
+        results=results
+    )
+
+
+@router.post("/users/import", response_model=UserImportResponse, tags=["User Management Requires (Admin or Manager Roles)"], name="import_users")
+async def import_users(rows: List[Dict[str, Any]] = Body(..., example=[{"email": "john.doe@example.com", "password": "Secure*1234"}]), db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Create many users from a JSON array of user objects.
+
+    Rows are validated like `POST /users/`; rows that are invalid or whose email or nickname
+    already exists are reported rather than failing the whole import. Verification emails
+    for created users are delivered through the email outbox.
+
+    Returns:
+    - UserImportResponse: Per-status counts and one result per row, in input order.
+    """
+    return await _import_users(db, rows, email_service)
+
+
+@router.post("/users/import/csv", response_model=UserImportResponse, tags=["User Management Requires (Admin or Manager Roles)"], name="import_users_csv")
+async def import_users_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Create many users from an uploaded CSV file.
+
+    The header row names `UserCreate` fields (at least `email` and `password`); empty cells
+    are treated as missing values. See `POST /users/import` for the response format.
+    """
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file must be UTF-8 encoded")
+    rows = [
+        {key: value or None for key, value in row.items() if key}
+        for row in csv.DictReader(io.StringIO(content))
+    ]
+    return await _import_users(db, rows, email_service)
+
+
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; an empty value starts cursor pagination."),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    next_cursor = prev_cursor = None
+    if cursor is not None:
+        try:
+            total_users, users, next_cursor, prev_cursor = await UserService.list_users_by_cursor(db, cursor, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        total_users, users = await UserService.list_users_with_count(db, skip, limit)
 
     user_responses = [
         UserResponse.model_validate(user) for user in users # pragma: no cover
     ]
     
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    pagination_links = generate_pagination_links(request, skip, limit, total_users, next_cursor, prev_cursor, cursor_mode=cursor is not None)
     
     # Construct the final response with pagination details
     return UserListResponse( # pragma: no cover
@@ -230,34 +292,54 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db
         return user
     raise HTTPException(status_code=400, detail="Email already exists")
 
-@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
+@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"], dependencies=[Depends(limit_login_attempts)])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
     try:
-        # Check if the account is locked
-        if await UserService.is_account_locked(session, form_data.username):
-            raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.") # pragma: no cover
-        logger.info(f"Checking username {form_data.username} ")
+        logger.info("Checking username %s", form_data.username)
         
-        # Authenticate user
+        # Authenticate user; a locked account is rejected with a 400 from the same lookup
         user = await UserService.login_user(session, form_data.username, form_data.password)
-        logger.info(f"User : {user} ")
+        logger.debug("User : %s", user)
         if user:
-            # Generate JWT token
-            access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-            access_token = create_access_token(
-                data={"sub": user.email, "role": str(user.role.name)},
-                expires_delta=access_token_expires
-            )
-            return {"access_token": access_token, "token_type": "bearer"}
+            # Generate JWT token, plus a refresh token so the session can be renewed without the password
+            refresh_token = await RefreshTokenService.issue(session, user)
+            return {"access_token": _user_access_token(user), "token_type": "bearer", "refresh_token": refresh_token}
         raise HTTPException(status_code=401, detail="Incorrect email or password.")
     except HTTPException as e: # pragma: no cover
         # Re-raise HTTP exceptions as-is
         raise e
     except Exception as e: # pragma: no cover
         # Log unexpected errors and return a generic 500 response
-        logger.error(f"Unexpected error during login: {e}")
+        logger.error("Unexpected error during login: %s", e)
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
+def _user_access_token(user) -> str:
+    return create_access_token(
+        data={"sub": user.email, "role": str(user.role.name)},
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+    )
+
+@router.post("/token/refresh", response_model=TokenResponse, tags=["Login and Registration"])
+async def refresh_access_token(request_data: RefreshTokenRequest, session: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    The presented refresh token stops working. Presenting it again revokes every token
+    rotated from the same login, so a leaked token is only usable until either party
+    refreshes.
+    """
+    rotated = await RefreshTokenService.rotate(session, request_data.refresh_token)
+    if rotated is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token.")
+    user, refresh_token = rotated
+    return {"access_token": _user_access_token(user), "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/logout/", status_code=status.HTTP_204_NO_CONTENT, tags=["Login and Registration"])
+async def logout(request_data: RefreshTokenRequest, session: AsyncSession = Depends(get_db)):
+    """Revoke a refresh token and every token rotated from the same login."""
+    await RefreshTokenService.revoke(session, request_data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 @router.get("/verify-email/{user_id}/{token}", status_code=status.HTTP_200_OK, name="verify_email", tags=["Login and Registration"])
 async def verify_email(user_id: UUID, token: str, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service)):
     """
@@ -270,7 +352,7 @@ async def verify_email(user_id: UUID, token: str, db: AsyncSession = Depends(get
         return {"message": "Email verified successfully"} # pragma: no cover
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired verification token") # pragma: no cover
 
-from app.schemas.user_schemas import UserSearchQueryRequest
+from app.schemas.user_schemas import UserSearchFilterRequest, UserSearchQueryRequest
 
 @router.get("/users-basic", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def basic_search_users(
@@ -282,29 +364,24 @@ async def basic_search_users(
     """
     Basic search endpoint for filtering users by username, email, role, or lock status.
     """
-    logger.info(f"Basic search initiated with filters: {query.dict(exclude_none=True)}")
-    total_users, users = await UserService.search_and_filter_users(
-        db,
-        username=query.username,
-        email=query.email,
-        role=query.role,
-        is_locked=query.is_locked,
-        skip=query.skip,
-        limit=query.limit,
-    )
+    logger.info("Basic search initiated with filters: %s", query.dict(exclude_none=True))
+    search_filters = query.dict(exclude_none=True, exclude={"skip", "limit", "cursor"})
+    next_cursor = prev_cursor = None
+    if query.cursor is not None:
+        try:
+            total_users, users, next_cursor, prev_cursor = await UserService.search_users_by_cursor(
+                db, search_filters, query.cursor, query.limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        total_users, users = await UserService.search_and_filter_users(db, search_filters, query.skip, query.limit)
 
     user_responses = [UserResponse.model_validate(user) for user in users]
-    pagination_links = generate_pagination_links(request, query.skip, query.limit, total_users)
+    pagination_links = generate_pagination_links(request, query.skip, query.limit, total_users, next_cursor, prev_cursor, cursor_mode=query.cursor is not None)
 
     # Include query filters in the response
-    filters = UserSearchQueryRequest(
-        username=query.username,
-        email=query.email,
-        role=query.role,
-        is_locked=query.is_locked,
-        skip=query.skip,
-        limit=query.limit,
-    )
+    filters = UserSearchFilterRequest(**query.dict())
 
     return UserListResponse(
         items=user_responses,
@@ -322,6 +399,8 @@ from app.schemas.user_schemas import UserSearchFilterRequest
 async def advanced_search_users(
     request: Request,
     filters: UserSearchFilterRequest,  # Use a schema for advanced filters
+    cursor: Optional[str] = Query(None, description="Keyset cursor overriding the body's; set by the `next`/`prev` links."),
+    limit: Optional[int] = Query(None, gt=0, le=100, description="Page size overriding the body's; set by the `next`/`prev` links."),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"])),
 ):
@@ -330,15 +409,29 @@ async def advanced_search_users(
 
     Args:
         - filters (UserSearchFilterRequest): JSON body containing search criteria.
+        - cursor, limit: Optional query parameters that override the body's, so the cursor
+          links of a page can be followed by POSTing the same body to them.
     """
-    logger.info(f"Advanced search initiated with filters: {filters.dict(exclude_none=True)}")
-    total_users, users = await UserService.advanced_search_users(
-        db,
-        filters=filters.dict(exclude_none=True),
-    )
+    overrides = {name: value for name, value in (("cursor", cursor), ("limit", limit)) if value is not None}
+    if overrides:
+        filters = filters.model_copy(update=overrides)
+    logger.info("Advanced search initiated with filters: %s", filters.dict(exclude_none=True))
+    next_cursor = prev_cursor = None
+    if filters.cursor is not None:
+        try:
+            total_users, users, next_cursor, prev_cursor = await UserService.search_users_by_cursor(
+                db, filters.dict(exclude_none=True, exclude={"skip", "limit", "cursor"}), filters.cursor, filters.limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        total_users, users = await UserService.advanced_search_users(
+            db,
+            filters=filters.dict(exclude_none=True),
+        )
 
     user_responses = [UserResponse.model_validate(user) for user in users]
-    pagination_links = generate_pagination_links(request, filters.skip, filters.limit, total_users)
+    pagination_links = generate_pagination_links(request, filters.skip, filters.limit, total_users, next_cursor, prev_cursor, cursor_mode=filters.cursor is not None)
 
     # Include filters in the response
     return UserListResponse(
@@ -397,22 +490,17 @@ async def update_user_bio(
     return UserResponse.model_validate(updated_user)
 
 
-@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
+@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"], dependencies=[Depends(limit_login_attempts)])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
     try:
         # Log the login attempt
-        logger.info(f"Login attempt for username: {form_data.username}")
+        logger.info("Login attempt for username: %s", form_data.username)
 
-        # Check if the account is locked
-        if await UserService.is_account_locked(session, form_data.username):
-            logger.warning(f"Account locked for username: {form_data.username}")
-            raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-        
-        # Authenticate user
+        # Authenticate user; a locked account is rejected with a 400 from the same lookup
         user = await UserService.login_user(session, form_data.username, form_data.password)
         if user:
             # Generate JWT token
-            logger.info(f"Login successful for username: {form_data.username}")
+            logger.info("Login successful for username: %s", form_data.username)
             access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
             access_token = create_access_token(
                 data={"sub": user.email, "role": str(user.role.name)},
@@ -421,15 +509,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Async
             return {"access_token": access_token, "token_type": "bearer"}
         
         # Log invalid login
-        logger.warning(f"Invalid login attempt for username: {form_data.username}")
+        logger.warning("Invalid login attempt for username: %s", form_data.username)
         raise HTTPException(status_code=401, detail="Incorrect email or password.")
     
     except HTTPException as e:
-        logger.error(f"HTTPException during login for username: {form_data.username}: {str(e)}")
+        logger.error("HTTPException during login for username: %s: %s", form_data.username, e)
         raise e
     
     except Exception as e:
-        logger.error(f"Unexpected error during login for username: {form_data.username}: {str(e)}")
+        logger.error("Unexpected error during login for username: %s: %s", form_data.username, e)
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
 
@@ -1,7 +1,7 @@
 
 from builtins import ValueError, any, bool, str
 from pydantic import BaseModel, EmailStr, Field, validator, root_validator
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -149,7 +149,7 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe", 
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
+    total: Optional[int] = Field(..., example=100, description="Total matching users; null for cursor pages, which are not counted")
     page: int = Field(..., example=1)
     size: int = Field(..., example=10)
     links: Optional[List[PaginationLink]]  # Accept PaginationLink objects directly
@@ -172,6 +172,8 @@ class UserSearchFilterRequest(BaseModel):
     created_to: Optional[datetime] = Field(None, example="2024-12-31T23:59:59")
     skip: int = Field(0, ge=0, example=0)
     limit: int = Field(10, gt=0, le=100, example=10)
+    match: Optional[Literal["contains", "prefix"]] = Field(None, example="contains", description="How username and email filters match: 'contains' (default) or 'prefix'.")
+    cursor: Optional[str] = Field(None, example="", description="Opaque keyset cursor; an empty value starts cursor pagination.")
 
 
 
@@ -182,6 +184,22 @@ class UserSearchQueryRequest(BaseModel):
     is_locked: Optional[bool] = Field(None, example=False, description="Filter users by account lock status.")
     skip: int = Field(0, ge=0, example=0, description="Pagination offset.")
     limit: int = Field(10, gt=0, le=100, example=10, description="Number of records to retrieve.")
+    match: Optional[Literal["contains", "prefix"]] = Field(None, example="contains", description="How username and email filters match: 'contains' (default) or 'prefix'.")
+    cursor: Optional[str] = Field(None, example="", description="Opaque keyset cursor; an empty value starts cursor pagination.")
+
+class UserImportRowResult(BaseModel):
+    row: int = Field(..., example=1, description="1-based position of the row in the import.")
+    email: Optional[str] = Field(None, example="john.doe@example.com")
+    status: Literal["created", "duplicate", "invalid", "error"] = Field(..., example="created")
+    id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    detail: Optional[str] = Field(None, example=None, description="Why the row was not created.")
+
+class UserImportResponse(BaseModel):
+    created: int = Field(..., example=1)
+    duplicates: int = Field(..., example=0)
+    invalid: int = Field(..., example=0)
+    errors: int = Field(..., example=0)
+    results: List[UserImportRowResult] = Field(...)
 
 from pydantic import BaseModel
 UserListResponse.update_forward_refs()
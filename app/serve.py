@@ -0,0 +1,75 @@
+"""
+Production server: gunicorn supervising uvicorn worker processes.
+
+Usage:
+    python -m app.serve
+
+Options come from settings (server_bind, server_workers, server_max_requests, ...), so
+they can be set through the environment like the rest of the configuration, e.g.
+`SERVER_WORKERS=4 python -m app.serve`. Unlike `uvicorn --reload`, there is no file
+watcher, every worker is its own process with its own event loop, and each worker is
+gracefully replaced after `server_max_requests` requests to bound memory growth.
+Workers use uvloop and httptools when they are installed.
+"""
+
+from builtins import AttributeError, dict, int, len, min, super
+import importlib.util
+import logging
+import os
+from gunicorn.app.base import BaseApplication
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+def default_workers() -> int:
+    """One worker per CPU this process may run on (respects container CPU sets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+def server_options() -> dict:
+    """Gunicorn settings derived from the application settings."""
+    return {
+        "bind": settings.server_bind,
+        "workers": settings.server_workers or default_workers(),
+        # The uvicorn worker picks uvloop and httptools automatically when importable
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "timeout": settings.server_timeout,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "keepalive": settings.server_keepalive,
+        "forwarded_allow_ips": settings.server_forwarded_allow_ips,
+    }
+
+class Server(BaseApplication):
+    """Gunicorn application serving `app.main:app` with the given options."""
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported in each worker after the fork, so no connections or threads are shared
+        from app.main import app
+        return app
+
+def main():
+    options = server_options()
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting %s workers on %s (%s event loop, %s HTTP parser)", options['workers'], options['bind'], loop, http)
+    if options["workers"] > 1 and settings.user_cache_backend == "memory":
+        logger.warning(
+            "Each worker has its own user cache; a changed user may be served stale by other workers for up to %ss. Set USER_CACHE_BACKEND=redis to share invalidations",
+            min(settings.user_cache_ttl, settings.user_cache_memory_ttl),
+        )
+    Server(options).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from builtins import Exception, float, int, len, list, min, str
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, update
+from app.models.email_outbox_model import EmailOutbox, OutboxStatus
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+class EmailOutboxWorker:
+    """
+    Background task that delivers emails queued in the `email_outbox` table.
+
+    The table is the source of truth, so entries survive restarts and are picked up by
+    polling every `poll_interval` seconds; `EmailService.notify_outbox` wakes the worker
+    immediately after new entries are committed. Due entries are claimed with
+    `FOR UPDATE SKIP LOCKED`, so several worker processes can drain the same table.
+    Failed deliveries are retried with exponential backoff until `max_attempts`.
+
+    Claiming is a short transaction that leases the entries for `lease` seconds by moving
+    their `next_attempt_at` forward; emails are then sent without holding a connection or
+    row locks, and each result is committed as soon as it is known. If the worker dies, only
+    the entry being sent can be sent twice; the rest of the batch is due again when the
+    lease runs out.
+    """
+    def __init__(
+        self,
+        email_service: EmailService,
+        session_factory,
+        max_attempts: int = 5,
+        base_delay: float = 2,
+        max_delay: float = 600,
+        poll_interval: float = 5,
+        batch_size: int = 20,
+        lease: float = 300,
+    ):
+        self.email_service = email_service
+        self.session_factory = session_factory
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before the next attempt after `attempts` failed attempts."""
+        return timedelta(seconds=min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+
+    async def _claim(self) -> List[EmailOutbox]:
+        """Lease a batch of due entries to this worker and count the attempt, in one short transaction."""
+        async with self.session_factory() as session:
+            now = datetime.now(timezone.utc)
+            query = (
+                select(EmailOutbox)
+                .where(EmailOutbox.status == OutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            entries = list((await session.execute(query)).scalars().all())
+            for entry in entries:
+                entry.attempts += 1
+                entry.next_attempt_at = now + self.lease
+            await session.flush()
+            session.expunge_all()  # Keep the loaded values; the entries outlive this session
+            await session.commit()
+            return entries
+
+    async def _record(self, entry: EmailOutbox, **values):
+        """Store the outcome of one delivery, unless the lease ran out and another worker claimed the entry since."""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == entry.id, EmailOutbox.attempts == entry.attempts)
+                .values(**values)
+            )
+            await session.commit()
+
+    async def drain_once(self) -> int:
+        """
+        Attempt delivery of one batch of due entries.
+
+        :return: The number of entries processed.
+        """
+        entries = await self._claim()
+        for entry in entries:
+            if datetime.now(timezone.utc) >= entry.next_attempt_at:
+                # Sending now could duplicate another worker's attempt; leave it to be reclaimed
+                continue
+            try:
+                await self.email_service.send_user_email(entry.payload, entry.email_type)
+            except Exception as e:
+                if entry.attempts >= self.max_attempts:
+                    values = {"status": OutboxStatus.FAILED}
+                    logger.error("Giving up on %s email to %s after %s attempts: %s", entry.email_type, entry.recipient, entry.attempts, e)
+                else:
+                    values = {"next_attempt_at": datetime.now(timezone.utc) + self.backoff(entry.attempts)}
+                    logger.warning("Failed to send %s email to %s (attempt %s): %s", entry.email_type, entry.recipient, entry.attempts, e)
+                await self._record(entry, last_error=str(e)[:500], **values)
+            else:
+                await self._record(entry, status=OutboxStatus.SENT, sent_at=datetime.now(timezone.utc))
+        return len(entries)
+
+    async def run(self):
+        """Drain the outbox until cancelled, sleeping until notified or the poll interval elapses."""
+        wakeup = self.email_service.outbox_wakeup
+        while not self._stopping.is_set():
+            wakeup.clear()
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                logger.error("Email outbox worker error: %s", e)
+                processed = 0
+            if processed >= self.batch_size:
+                continue  # A full batch suggests more entries are already due
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 0):
+        """
+        Stop the worker. A batch being delivered gets up to `timeout` seconds to finish;
+        after that (or at once, by default) the worker is cancelled, and the unsent rest of
+        the batch is delivered once its lease runs out.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            self.email_service.outbox_wakeup.set()  # End the idle wait
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
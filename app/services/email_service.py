@@ -1,37 +1,86 @@
 # email_service.py
 from builtins import ValueError, dict, str
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
 from settings.config import settings
 from app.utils.smtp_connection import SMTPClient
+from app.utils.metrics import REGISTRY, HistogramFamily
 from app.utils.template_manager import TemplateManager
+from app.models.email_outbox_model import EmailOutbox
 from app.models.user_model import User
 
+SUBJECT_MAP = {
+    'email_verification': "Verify Your Account",
+    'password_reset': "Password Reset Instructions",
+    'account_locked': "Account Locked Notification"
+}
+
+email_send_time = HistogramFamily(
+    "email_send_duration_seconds",
+    "Time to hand an email to the SMTP server, by email type.",
+    ("email_type",),
+    registry=REGISTRY,
+)
+
 class EmailService:
     def __init__(self, template_manager: TemplateManager):
         self.smtp_client = SMTPClient(
             server=settings.smtp_server,
             port=settings.smtp_port,
             username=settings.smtp_username,
-            password=settings.smtp_password
+            password=settings.smtp_password,
+            pool_size=settings.smtp_pool_size,
+            idle_timeout=settings.smtp_idle_timeout,
+            timeout=settings.smtp_timeout,
         )
         self.template_manager = template_manager
+        # Set when new outbox entries are committed, to wake the outbox worker early
+        self.outbox_wakeup = asyncio.Event()
 
     async def send_user_email(self, user_data: dict, email_type: str):
-        subject_map = {
-            'email_verification': "Verify Your Account",
-            'password_reset': "Password Reset Instructions",
-            'account_locked': "Account Locked Notification"
-        }
-
-        if email_type not in subject_map:
+        if email_type not in SUBJECT_MAP:
             raise ValueError("Invalid email type")
 
         html_content = self.template_manager.render_template(email_type, **user_data)
-        self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
+        start = time.perf_counter()
+        try:
+            # smtplib is blocking; keep it off the event loop
+            await asyncio.to_thread(self.smtp_client.send_email, SUBJECT_MAP[email_type], html_content, user_data['email'])
+        finally:
+            email_send_time.labels(email_type).observe(time.perf_counter() - start)
 
-    async def send_verification_email(self, user: User):
+    async def queue_user_email(self, session: AsyncSession, user_data: dict, email_type: str) -> EmailOutbox:
+        """
+        Add an email to the outbox as part of the caller's transaction.
+
+        The email is delivered by the outbox worker once the transaction commits; call
+        `notify_outbox` after committing so delivery starts without waiting for the next poll.
+        """
+        if email_type not in SUBJECT_MAP:
+            raise ValueError("Invalid email type")
+        entry = EmailOutbox(email_type=email_type, recipient=user_data['email'], payload=user_data)
+        session.add(entry)
+        return entry
+
+    def notify_outbox(self):
+        """Wake the outbox worker after new entries have been committed."""
+        self.outbox_wakeup.set()
+
+    def close(self):
+        """Close pooled SMTP connections held by this service."""
+        self.smtp_client.close()
+
+    def _verification_email_data(self, user: User) -> dict:
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
-        await self.send_user_email({
+        return {
             "name": user.first_name,
             "verification_url": verification_url,
             "email": user.email
-        }, 'email_verification')
\ No newline at end of file
+        }
+
+    async def send_verification_email(self, user: User):
+        await self.send_user_email(self._verification_email_data(user), 'email_verification')
+
+    async def queue_verification_email(self, session: AsyncSession, user: User) -> EmailOutbox:
+        return await self.queue_user_email(session, self._verification_email_data(user), 'email_verification')
@@ -0,0 +1,94 @@
+from builtins import Exception, bool, classmethod, round
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, literal, select
+from app.database import Database
+from app.models.email_outbox_model import EmailOutbox, OutboxStatus
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pending outbox emails are counted up to this many, so the count stays cheap however large the backlog
+EMAIL_BACKLOG_COUNT_LIMIT = 10000
+
+class HealthService:
+    """
+    Cheap checks behind the readiness probe.
+
+    The database check is a single query that both pings the database and counts pending
+    outbox emails. Its result is reused for `readiness_cache_ttl` seconds, and concurrent
+    probes wait for the same query, so probes cost at most one query per TTL per worker.
+    """
+    _database_result: Optional[Tuple[float, Dict]] = None
+    _database_lock = asyncio.Lock()
+
+    @classmethod
+    async def _query_database(cls) -> int:
+        pending = (
+            select(literal(1))
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status == OutboxStatus.PENDING)
+            .limit(EMAIL_BACKLOG_COUNT_LIMIT)
+            .subquery()
+        )
+        async with Database.get_session_factory()() as session:
+            return await session.scalar(select(func.count()).select_from(pending))
+
+    @classmethod
+    async def database_check(cls) -> Dict:
+        """Return `{"ok": bool, "email_backlog": int | None}`, from cache when fresh."""
+        cached = cls._database_result
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        async with cls._database_lock:
+            cached = cls._database_result
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]  # Another probe refreshed it while this one waited
+            try:
+                backlog = await asyncio.wait_for(cls._query_database(), settings.readiness_db_timeout)
+                result = {"ok": True, "email_backlog": backlog}
+            except Exception as e:
+                logger.warning("Readiness database check failed: %r", e)
+                result = {"ok": False, "email_backlog": None}
+            cls._database_result = (time.monotonic() + settings.readiness_cache_ttl, result)
+            return result
+
+    @classmethod
+    def clear_cache(cls):
+        cls._database_result = None
+
+    @classmethod
+    async def readiness(cls, warmed_up: bool) -> Tuple[bool, Dict]:
+        """
+        Decide whether this worker should receive traffic.
+
+        Unready while warmup is incomplete, while at least `readiness_max_pool_usage` of the
+        connection pool is checked out (new requests would queue for a connection), when the
+        database does not answer within `readiness_db_timeout`, or when more than
+        `readiness_max_email_backlog` emails are pending (if that limit is set).
+
+        :return: Whether the worker is ready, and the individual check results.
+        """
+        pool_usage = Database.pool_usage()
+        pool_saturated = pool_usage is not None and pool_usage >= settings.readiness_max_pool_usage
+        checks = {
+            "warmed_up": warmed_up,
+            "pool_usage": round(pool_usage, 3) if pool_usage is not None else None,
+            "pool_saturated": pool_saturated,
+        }
+        if pool_saturated:
+            # The ping would have to wait for a connection; the answer is already no
+            return False, checks
+
+        database = await cls.database_check()
+        checks["database"] = database["ok"]
+        checks["email_backlog"] = database["email_backlog"]
+        backlog_exceeded = (
+            settings.readiness_max_email_backlog > 0
+            and database["email_backlog"] is not None
+            and database["email_backlog"] > settings.readiness_max_email_backlog
+        )
+        checks["email_backlog_exceeded"] = backlog_exceeded
+        return warmed_up and database["ok"] and not backlog_exceeded, checks
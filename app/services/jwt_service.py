@@ -1,9 +1,40 @@
 # app/services/jwt_service.py
-from builtins import dict, str
+from builtins import bytes, dict, float, int, isinstance, len, round, str
+import hashlib
+import time
+from collections import OrderedDict
 import jwt
 from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from app.services.signing_key_service import ASYMMETRIC_ALGORITHMS, KeyRing
+from app.utils.metrics import Histogram
 from settings.config import settings
 
+# Token verification is expected to take microseconds, far below the default latency buckets
+AUTH_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+_key_ring: Optional[KeyRing] = None
+
+def get_key_ring() -> Optional[KeyRing]:
+    """
+    Shared key ring for asymmetric signing, or None when `jwt_algorithm` uses the shared secret.
+
+    Keys are created on first use if `jwt_keys_dir` holds none.
+    """
+    global _key_ring
+    if settings.jwt_algorithm not in ASYMMETRIC_ALGORITHMS:
+        return None
+    if _key_ring is None or _key_ring.algorithm != settings.jwt_algorithm:
+        _key_ring = KeyRing(
+            settings.jwt_keys_dir,
+            settings.jwt_algorithm,
+            rotation_interval=settings.jwt_key_rotation_days * 86400,
+            # Every worker reloads and every verifier's cached JWKS expires before a new key signs
+            publish_delay=settings.jwks_max_age + settings.jwt_key_check_interval,
+            retire_after=settings.access_token_expire_minutes * 60 + settings.jwt_key_check_interval,
+        )
+    return _key_ring
+
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     # Convert role to uppercase before encoding the JWT
@@ -11,12 +42,97 @@ def create_access_token(*, data: dict, expires_delta: timedelta = None):
         to_encode['role'] = to_encode['role'].upper()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    key_ring = get_key_ring()
+    if key_ring is None:
+        return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    signing_key = key_ring.signing_key()
+    encoded_jwt = jwt.encode(to_encode, signing_key.private_key, algorithm=signing_key.algorithm, headers={"kid": signing_key.kid})
     return encoded_jwt
 
 def decode_token(token: str):
     try:
-        decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        key_ring = get_key_ring()
+        if key_ring is None:
+            key = settings.jwt_secret_key
+        else:
+            key = key_ring.public_key(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                return None
+        decoded = jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
         return decoded
     except jwt.PyJWTError:
         return None
+
+class TokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by the SHA-256 digest of the token.
+
+    Each payload is served until the token's own `exp`, so a cached token is accepted for
+    exactly as long as `jwt.decode` would accept it. Only valid tokens are cached.
+    It is only used from async dependencies on the event loop, so it needs no lock.
+    """
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, payload: Dict):
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+token_cache = TokenCache(max_size=settings.auth_token_cache_size)
+# Time spent authenticating a request's bearer token, whether or not it was cached
+auth_time = Histogram(buckets=AUTH_BUCKETS)
+
+def decode_token_cached(token: str) -> Optional[Dict]:
+    """
+    Like `decode_token`, but serves tokens verified earlier from `token_cache`.
+
+    The returned payload is shared with the cache and must not be modified.
+    """
+    start = time.perf_counter()
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if payload is not None:
+            token_cache.put(token, payload)
+    auth_time.observe(time.perf_counter() - start)
+    return payload
@@ -0,0 +1,111 @@
+from builtins import bool, classmethod, str
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.refresh_token_model import RefreshToken
+from app.models.user_model import User
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RefreshTokenService:
+    """
+    Issue, rotate and revoke refresh tokens.
+
+    Renewing a session with a refresh token costs a lookup by the token's digest and an
+    insert, instead of a bcrypt verification and the login bookkeeping writes.
+    """
+    @classmethod
+    def _hash(cls, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def _add_token(cls, session: AsyncSession, user_id: UUID, family_id: UUID) -> Tuple[RefreshToken, str]:
+        token = secrets.token_urlsafe(32)
+        record = RefreshToken(
+            id=uuid4(),
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=cls._hash(token),
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.refresh_token_expire_minutes),
+        )
+        session.add(record)
+        return record, token
+
+    @classmethod
+    async def issue(cls, session: AsyncSession, user: User) -> str:
+        """Start a new token family for `user` and return its first refresh token."""
+        _, token = cls._add_token(session, user.id, uuid4())
+        await session.commit()
+        return token
+
+    @classmethod
+    async def rotate(cls, session: AsyncSession, token: str) -> Optional[Tuple[User, str]]:
+        """
+        Exchange a refresh token for a new one in the same family.
+
+        The presented token is locked while it is rotated, so concurrent uses of one token
+        cannot both succeed. A token that was already rotated or revoked revokes its whole
+        family (reuse detection).
+
+        :return: The token's user and the replacement token, or None if the token is unknown,
+                 revoked, expired, or its user is locked.
+        """
+        now = datetime.now(timezone.utc)
+        query = (
+            select(RefreshToken, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(RefreshToken.token_hash == cls._hash(token))
+            .with_for_update(of=RefreshToken)
+        )
+        row = (await session.execute(query)).first()
+        if row is None:
+            return None
+        record, user = row
+        if record.revoked_at is not None:
+            logger.warning("Refresh token reuse detected for user %s; revoking its token family.", record.user_id)
+            await cls._revoke_family(session, record.family_id, now)
+            await session.commit()
+            return None
+        if record.expires_at <= now or user.is_locked:
+            return None
+
+        replacement, new_token = cls._add_token(session, user.id, record.family_id)
+        record.revoked_at = now
+        record.replaced_by = replacement.id
+        await session.commit()
+        return user, new_token
+
+    @classmethod
+    async def revoke(cls, session: AsyncSession, token: str) -> bool:
+        """Revoke the family of a refresh token (logout). Returns False for an unknown token."""
+        family_id = (await session.execute(
+            select(RefreshToken.family_id).where(RefreshToken.token_hash == cls._hash(token))
+        )).scalar()
+        if family_id is None:
+            return False
+        await cls._revoke_family(session, family_id, datetime.now(timezone.utc))
+        await session.commit()
+        return True
+
+    @classmethod
+    async def revoke_for_user(cls, session: AsyncSession, user_id: UUID):
+        """Revoke every active refresh token of a user in the caller's transaction."""
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+
+    @classmethod
+    async def _revoke_family(cls, session: AsyncSession, family_id: UUID, now: datetime):
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
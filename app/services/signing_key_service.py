@@ -0,0 +1,231 @@
+from builtins import Exception, FileNotFoundError, ValueError, bool, dict, float, int, isinstance, len, list, max, open, sorted, str, zip
+import asyncio
+import logging
+import os
+from contextlib import contextmanager
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+try:
+    import fcntl
+except ImportError:  # Windows; development only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Algorithms signed with a private key from the key ring; anything else uses the shared secret
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+class SigningKey:
+    """
+    A private signing key from the key ring.
+
+    Attributes:
+        kid (str): Key id, sent in the token header. Starts with the creation time in Unix
+            seconds, so key age does not depend on file timestamps.
+        algorithm (str): JWT algorithm the key signs with.
+        private_key: The `cryptography` private key.
+        created_at (float): Creation time in Unix seconds.
+    """
+    def __init__(self, kid: str, algorithm: str, private_key):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.created_at = float(kid.split("-", 1)[0])
+
+    def jwk(self) -> Dict:
+        """Public half of the key as a JSON Web Key."""
+        if self.algorithm == "RS256":
+            jwk = RSAAlgorithm.to_jwk(self.public_key, as_dict=True)
+        else:
+            jwk = OKPAlgorithm.to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+class KeyRing:
+    """
+    Private keys for asymmetric JWT signing, stored as PEM files named `<kid>.pem` in `keys_dir`.
+
+    Every worker process reads the same directory, so a key created by one worker is picked
+    up by the others on their next `refresh`. Hosts or containers that issue or verify the
+    same tokens must share the directory too (a common volume or provisioned files), or each
+    creates its own keys and rejects the others' tokens. Rotation holds an exclusive lock on
+    `.lock` in the directory, so workers starting together create a single first key.
+    Several keys are active at once:
+
+    - A new key is created `publish_delay` seconds before it starts signing, so verifiers
+      holding a cached JWKS document (and workers that have not reloaded yet) see it before
+      any token carries its kid.
+    - The newest key that has been published for `publish_delay` seconds signs new tokens.
+    - Older keys keep verifying until every token they signed has expired (`retire_after`
+      seconds after their successor took over), then they are deleted.
+    """
+    def __init__(self, keys_dir: str, algorithm: str, rotation_interval: float, publish_delay: float, retire_after: float):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm {algorithm!r}; expected one of {ASYMMETRIC_ALGORITHMS}")
+        self.keys_dir = Path(keys_dir)
+        self.algorithm = algorithm
+        self.rotation_interval = rotation_interval
+        self.publish_delay = publish_delay
+        self.retire_after = retire_after
+        self._keys: List[SigningKey] = []  # oldest first
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _generate_private_key(self):
+        if self.algorithm == "RS256":
+            return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return ed25519.Ed25519PrivateKey.generate()
+
+    def _read_keys(self) -> List[SigningKey]:
+        keys = []
+        for path in self.keys_dir.glob("*.pem"):
+            try:
+                private_key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+                key = SigningKey(path.stem, self.algorithm, private_key)
+            except Exception as e:
+                logger.error("Ignoring unreadable signing key %s: %s", path.name, e)
+                continue
+            # Keys left over from a different algorithm setting cannot sign or verify
+            if isinstance(private_key, rsa.RSAPrivateKey) == (self.algorithm == "RS256"):
+                keys.append(key)
+        return sorted(keys, key=lambda key: key.created_at)
+
+    def refresh(self):
+        """Reload the keys from `keys_dir`."""
+        keys = self._read_keys()
+        with self._lock:
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None:
+            self.refresh()
+            if not self._keys:
+                self.rotate()
+
+    def signing_key(self) -> SigningKey:
+        """The key new tokens are signed with."""
+        self._ensure_loaded()
+        keys = self._keys
+        published_before = time.time() - self.publish_delay
+        for key in reversed(keys):
+            if key.created_at <= published_before:
+                return key
+        # Only unpublished keys exist (first start): sign with the newest rather than not at all
+        return keys[-1]
+
+    def public_key(self, kid: str):
+        """
+        Public key for `kid`, or None if the key is unknown or retired.
+
+        An unknown kid triggers a reload (at most once per second), in case another worker
+        created the key after this one last looked.
+        """
+        self._ensure_loaded()
+        for key in self._keys:
+            if key.kid == kid:
+                return key.public_key
+        if time.monotonic() - self._loaded_at >= 1:
+            self.refresh()
+            for key in self._keys:
+                if key.kid == kid:
+                    return key.public_key
+        return None
+
+    def jwks(self) -> Dict:
+        """All active public keys as a JWK Set."""
+        self._ensure_loaded()
+        return {"keys": [key.jwk() for key in self._keys]}
+
+    def _write_key(self, private_key) -> str:
+        kid = f"{int(time.time())}-{secrets.token_hex(4)}"
+        pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        self.keys_dir.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name and rename, so other workers never read a partial file
+        tmp_path = self.keys_dir / f".{kid}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, "wb") as file:
+            file.write(pem)
+        os.replace(tmp_path, self.keys_dir / f"{kid}.pem")
+        return kid
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the key directory lock, so only one process at a time decides on and creates keys."""
+        self.keys_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.keys_dir / ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def rotate(self, force: bool = False) -> bool:
+        """
+        Create a new key if the newest one is due for replacement, then delete retired keys.
+
+        A key is due `publish_delay` seconds before it has signed for `rotation_interval`
+        seconds, so its successor is published in time to take over on schedule.
+
+        :return: True if a key was created.
+        """
+        with self._exclusive():
+            # Reread under the lock: a worker that held it before may have just created the key
+            self.refresh()
+            keys = self._keys
+            now = time.time()
+            created = False
+            if force or not keys or keys[-1].created_at + max(0, self.rotation_interval - self.publish_delay) <= now:
+                kid = self._write_key(self._generate_private_key())
+                logger.info("Created JWT signing key %s", kid)
+                created = True
+
+            # A key signs until the next key is published; its tokens expire `retire_after` later
+            for key, successor in zip(keys, keys[1:]):
+                if successor.created_at + self.publish_delay + self.retire_after <= now:
+                    try:
+                        (self.keys_dir / f"{key.kid}.pem").unlink()
+                        logger.info("Retired JWT signing key %s", key.kid)
+                    except FileNotFoundError:
+                        pass  # Removed by hand, or by a worker on a host without shared locks
+            self.refresh()
+        return created
+
+class KeyRotationWorker:
+    """Background task that reloads the key ring every `check_interval` seconds and rotates keys when due."""
+    def __init__(self, key_ring: KeyRing, check_interval: float = 60):
+        self.key_ring = key_ring
+        self.check_interval = check_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        while True:
+            try:
+                # Key generation and file I/O block; keep them off the event loop
+                await asyncio.to_thread(self.key_ring.rotate)
+            except Exception as e:
+                logger.error("JWT signing key rotation failed: %s", e)
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
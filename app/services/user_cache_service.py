@@ -0,0 +1,77 @@
+from builtins import dict, isinstance, round, str, type
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.models.user_model import User
+from app.utils.cache import CacheBackend
+
+# Python type of each cached column, used to restore values from JSON backends
+_COLUMN_TYPES = {column.key: column.type.python_type for column in User.__table__.columns}
+
+def _restore(name: str, value: Any) -> Any:
+    python_type = _COLUMN_TYPES[name]
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+class UserCache:
+    """
+    Read-through cache of `users` rows for lookups by id, email and nickname.
+
+    A row is stored once under its id as a dict of column values; email and nickname keys
+    only point at the id. A pointer left behind by a changed email or nickname is detected
+    by comparing the field and treated as a miss, so invalidating a user only needs the id.
+    Hits and misses are counted for monitoring.
+    """
+    LOOKUP_FIELDS = ("id", "email", "nickname")
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(field: str, value: Any) -> str:
+        return f"user:{field}:{value}"
+
+    async def get(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return the cached column values of the user whose `field` equals `value`, or None."""
+        if field == "id":
+            data = await self.backend.get(self._key("id", value))
+        else:
+            pointer = await self.backend.get(self._key(field, value))
+            data = await self.backend.get(self._key("id", pointer["id"])) if pointer else None
+        if data is not None:
+            data = {name: _restore(name, column_value) for name, column_value in data.items()}
+            if str(data[field]) != str(value):
+                data = None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    async def put(self, user: User):
+        data = {name: getattr(user, name) for name in _COLUMN_TYPES}
+        await self.backend.set(self._key("id", user.id), data)
+        for field in ("email", "nickname"):
+            await self.backend.set(self._key(field, data[field]), {"id": str(user.id)})
+
+    async def invalidate(self, user_id: Any):
+        await self.backend.delete(self._key("id", user_id))
+
+    async def clear(self):
+        await self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -1,20 +1,27 @@
 
 from fastapi import HTTPException
-from builtins import Exception, bool, classmethod, int, str
-from datetime import datetime, timezone
+from builtins import Exception, ValueError, bool, classmethod, int, len, max, set, str, zip
+from datetime import datetime, timedelta, timezone
 import secrets
 from typing import Optional, Dict, List
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
+from sqlalchemy import and_, case, cast, exists, func, inspect, literal, not_, null, or_, update, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_email_service, get_settings
+from app.dependencies import get_email_service, get_settings, get_user_cache
+from app.models.system_state_model import SYSTEM_STATE_ID, SystemState
 from app.models.user_model import User
 from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password, validate_password
-from uuid import UUID
+from app.utils.nickname_gen import generate_nickname, generate_nicknames
+from app.utils.pagination import CURSOR_NEXT, CURSOR_PREV, decode_cursor, encode_cursor
+from app.utils.security import generate_verification_token, hash_password_async, hash_passwords_async, verify_password_async
+from uuid import UUID, uuid4
 from app.services.email_service import EmailService
+from app.services.refresh_token_service import RefreshTokenService
 from app.models.user_model import UserRole
 from app.utils.validators import validate_url_safe_username
 from sqlalchemy.exc import IntegrityError
@@ -26,6 +33,9 @@ from typing import List, Tuple
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Attempts at a free auto-generated nickname before giving up
+NICKNAME_ATTEMPTS = 10
+
 class UserService:
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query, commit: bool = False):
@@ -35,102 +45,194 @@ class UserService:
                 await session.commit()
             return result
         except SQLAlchemyError as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             await session.rollback()
             return None
 
 
     @classmethod
-    async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
+    async def _fetch_user(cls, session: AsyncSession, refresh: bool = False, **filters) -> Optional[User]:
         query = select(User).filter_by(**filters)
+        if refresh:
+            # Overwrite a copy already in the session, which may have come from the cache
+            query = query.execution_options(populate_existing=True)
         result = await cls._execute_query(session, query, commit=False)  # Explicitly specify commit=False for clarity
         return result.scalars().first() if result else None
 
+    @classmethod
+    def _loaded_user(cls, session: AsyncSession, user_id) -> Optional[User]:
+        """Return the user with `user_id` if `session` already holds a current copy of it."""
+        try:
+            user = session.identity_map.get(identity_key(User, UUID(str(user_id))))
+        except ValueError:
+            return None
+        if user is None:
+            return None
+        state = inspect(user)
+        if state.expired_attributes or state.deleted or state.was_deleted:
+            return None
+        return user
+
+    @classmethod
+    async def _get_user(cls, session: AsyncSession, field: str, value) -> Optional[User]:
+        """
+        Look up a user by `field` (id, email or nickname) through the user cache.
+
+        A user already loaded in `session` is returned without a query, a cached row is
+        attached to the session without a query, and otherwise the row is read from the
+        database and cached. Methods that change a user read it with `_fetch_user(refresh=True)`
+        instead and invalidate the cache entry after committing.
+        """
+        if field == "id":
+            loaded = cls._loaded_user(session, value)
+            if loaded is not None:
+                return loaded
+        user_cache = get_user_cache()
+        if user_cache is None:
+            return await cls._fetch_user(session, **{field: value})
+        data = await user_cache.get(field, value)
+        if data is not None:
+            loaded = cls._loaded_user(session, data["id"])
+            if loaded is not None:
+                return loaded
+            user = User(**data)
+            make_transient_to_detached(user)
+            return await session.merge(user, load=False)
+        user = await cls._fetch_user(session, **{field: value})
+        if user is not None:
+            await user_cache.put(user)
+        return user
+
+    @classmethod
+    async def _invalidate_cached_user(cls, user_id):
+        user_cache = get_user_cache()
+        if user_cache is not None:
+            await user_cache.invalidate(user_id)
+
     @classmethod
     async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
-        return await cls._fetch_user(session, id=user_id)
+        return await cls._get_user(session, "id", user_id)
 
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
-        return await cls._fetch_user(session, nickname=nickname)
+        return await cls._get_user(session, "nickname", nickname)
 
     @classmethod
     async def get_by_email(cls, session: AsyncSession, email: str) -> Optional[User]:
-        return await cls._fetch_user(session, email=email)
+        return await cls._get_user(session, "email", email)
 
     @classmethod
     async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService) -> Optional[User]:
+        """
+        Create a user and queue their verification email.
+
+        The user is written with one `INSERT ... ON CONFLICT DO NOTHING RETURNING` statement:
+        the unique indexes on email and nickname detect duplicates, and the same statement makes
+        the user an ADMIN while the bootstrap flag in `system_state` is unset and no users exist.
+        A successful registration therefore costs the insert plus the commit, which also writes
+        the outbox entry. Only a conflicting insert is followed by a lookup, to tell a taken email
+        from a collision on a generated nickname, which is retried with a nickname from
+        `allocate_nicknames`.
+        """
         try:
-           # Check if the user is the first user
-           is_first_user = await cls.is_first_user(session)
-           logger.debug(f"is_first_user: {is_first_user}")  # Debug statement
-           if is_first_user:
-               user_data["role"] = UserRole.ADMIN.name  # Automatically assign ADMIN role
-           else:
-               # Set default role if not provided
-               user_data.setdefault("role", UserRole.AUTHENTICATED.name)
-           logger.debug(f"Assigned role: {user_data['role']}")
            validated_data = UserCreate(**user_data).model_dump()
-
-           # Check for existing email
-           existing_user = await cls.get_by_email(session, validated_data['email'])
-           if existing_user:
-               logger.error("User with given email already exists.")
-               return None
-
-           # Validate and hash password
-           password = validated_data.pop('password')
-           try:
-               validate_password(password)  # Ensures password meets security criteria
-           except ValueError as e: # pragma: no cover
-               logger.error(f"Password validation failed: {e}")
+           validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+           generate = not validated_data.get("nickname")
+           if generate:
+               validated_data["nickname"] = generate_nickname()
+
+           new_user = None
+           for _ in range(NICKNAME_ATTEMPTS):
+               new_user = await cls._insert_user(session, validated_data)
+               if new_user is not None:
+                   break
+               if not generate or await cls.get_by_email(session, validated_data['email']):
+                   logger.error("User with given email or nickname already exists.")
+                   return None
+               # The generated nickname is taken; switch to one already checked against the table
+               nicknames = await cls.allocate_nicknames(session, 1)
+               if not nicknames:
+                   break # pragma: no cover
+               validated_data["nickname"] = nicknames[0]
+           if new_user is None:
+               logger.error("Could not generate a unique nickname.") # pragma: no cover
                return None # pragma: no cover
-           validated_data['hashed_password'] = hash_password(password)
+           if new_user.role == UserRole.ADMIN and not await cls._claim_admin_bootstrap(session):
+               # A concurrent registration claimed the first-admin role before us
+               new_user.role = UserRole.ANONYMOUS
+           logger.debug("Assigned role: %s", new_user.role)
 
-           # Check for existing nickname
-           if validated_data.get("nickname"):
-               existing_nickname = await cls.get_by_nickname(session, validated_data["nickname"])
-               if existing_nickname:
-                   logger.error("User with given nickname already exists.")
-                   return None
-           else:
-               # Auto-generate a unique nickname if not provided
-               new_nickname = generate_nickname()
-               while await cls.get_by_nickname(session, new_nickname):
-                   new_nickname = generate_nickname() # pragma: no cover
-               validated_data["nickname"] = new_nickname
-
-           # Prepare new user
-           new_user = User(**validated_data)
-           
-           # Assign role explicitly based on whether it’s the first user
-           new_user.role = UserRole.ADMIN if is_first_user else UserRole.ANONYMOUS
-
-           # Add and commit new user
-           new_user.verification_token = generate_verification_token()
-           session.add(new_user)
+           # Queue the verification email in the same transaction
+           await email_service.queue_verification_email(session, new_user)
            await session.commit()
-           await session.refresh(new_user)  # Ensure in-memory reflects database state
 
-           # Send verification email
-           await email_service.send_verification_email(new_user)
+           # Delivery happens in the outbox worker, off the request path
+           email_service.notify_outbox()
            return new_user
 
+        except HTTPException:
+            raise  # Re-raise known HTTP exceptions (e.g. hashing pool saturated)
         except ValidationError as e:
-            logger.error(f"Validation error during user creation: {e}")
+            logger.error("Validation error during user creation: %s", e)
             return None
         except Exception as e: # pragma: no cover
-            logger.error(f"Unexpected error during user creation: {e}")
+            logger.error("Unexpected error during user creation: %s", e)
+            await session.rollback()
             return None # pragma: no cover
 
+    @classmethod
+    async def _insert_user(cls, session: AsyncSession, validated_data: Dict) -> Optional[User]:
+        """
+        Insert one user, returning the persisted row, or None if the email or nickname is taken.
+
+        The role is ADMIN while the first-admin bootstrap is pending and ANONYMOUS otherwise;
+        an ADMIN result must still be confirmed with `_claim_admin_bootstrap`.
+        """
+        role_type = User.__table__.c.role.type
+        role = case(
+            (cls._admin_bootstrap_pending(), cast(literal(UserRole.ADMIN.name), role_type)),
+            else_=cast(literal(UserRole.ANONYMOUS.name), role_type),
+        )
+        statement = (
+            pg_insert(User)
+            .values(
+                **validated_data,
+                id=uuid4(),
+                role=role,
+                verification_token=generate_verification_token(),
+            )
+            .on_conflict_do_nothing()
+            .returning(User)
+        )
+        return (await session.scalars(statement)).first()
+
+    @classmethod
+    def _admin_bootstrap_pending(cls):
+        """SQL condition that holds until the first ADMIN has been created: the flag is unset and no users exist."""
+        bootstrapped = select(SystemState.admin_bootstrapped).where(SystemState.id == SYSTEM_STATE_ID).scalar_subquery()
+        return and_(not_(bootstrapped), not_(exists().select_from(User)))
+
+    @classmethod
+    async def _claim_admin_bootstrap(cls, session: AsyncSession) -> bool:
+        """
+        Set the bootstrap flag in the caller's transaction, returning False if it was already set.
+
+        The conditional UPDATE locks the `system_state` row, so concurrent claims are serialized
+        and exactly one of them succeeds; a claim made by a transaction that rolls back is released.
+        """
+        statement = (
+            update(SystemState)
+            .where(SystemState.id == SYSTEM_STATE_ID, SystemState.admin_bootstrapped.is_(False))
+            .values(admin_bootstrapped=True)
+            .returning(SystemState.id)
+        )
+        return (await session.execute(statement)).first() is not None
+
     @classmethod
     async def is_first_user(cls, session: AsyncSession) -> bool:
-       """Check if the current user is the first user in the database."""
-       query = select(func.count()).select_from(User)
-       result = await session.execute(query)
-       count = result.scalar()  # Ensure count is an integer
-       logger.debug(f"User count in database: {count}")
-       return count == 0
+       """Check whether the next user created would become the first ADMIN."""
+       result = await session.execute(select(cls._admin_bootstrap_pending()))
+       return bool(result.scalar())
 
     @classmethod
     async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
@@ -165,36 +267,39 @@ class UserService:
 
             # Hash the password if being updated
             if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password')) # pragma: no cover
+                validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password')) # pragma: no cover
 
             # Update the user
             query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
-            await cls._execute_query(session, query)
+            await cls._execute_query(session, query, commit=True)
+            # Only after the commit, or a concurrent read could cache the old row again
+            await cls._invalidate_cached_user(user_id)
 
             # Retrieve the updated user
-            updated_user = await cls.get_by_id(session, user_id)
+            updated_user = await cls._fetch_user(session, refresh=True, id=user_id)
             if updated_user:
                 session.refresh(updated_user)  # Explicitly refresh the updated user object
-                logger.info(f"User {user_id} updated successfully.")
+                logger.info("User %s updated successfully.", user_id)
                 return updated_user
 
-            logger.error(f"User {user_id} not found after update attempt.")
+            logger.error("User %s not found after update attempt.", user_id)
             return None
 
         except HTTPException:
             raise  # Re-raise known HTTP exceptions
         except Exception as e:
-            logger.error(f"Unexpected error during user update: {e}")
+            logger.error("Unexpected error during user update: %s", e)
             return None
 
     @classmethod
     async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
+        user = await cls._fetch_user(session, refresh=True, id=user_id)
         if not user:
-            logger.info(f"User with ID {user_id} not found.")
+            logger.info("User with ID %s not found.", user_id)
             return False
         await session.delete(user)
         await session.commit()
+        await cls._invalidate_cached_user(user_id)
         return True
 
     @classmethod
@@ -203,6 +308,54 @@ class UserService:
         result = await cls._execute_query(session, query)
         return result.scalars().all() if result else []
 
+    @classmethod
+    async def _paginate(cls, session: AsyncSession, query, skip: int, limit: int) -> Tuple[int, List[User]]:
+        """
+        Fetch one page of `query` together with the total number of matching rows.
+
+        The total comes from a `count(*) OVER ()` window on the page query itself, so a page
+        costs a single round trip. Only when the page is empty past the first page (so no row
+        carries the total) is a separate count issued.
+        """
+        paged_query = query.add_columns(func.count().over().label("total_count")).offset(skip).limit(limit)
+        rows = (await session.execute(paged_query)).all()
+        if rows:
+            return rows[0].total_count, [row[0] for row in rows]
+        if skip == 0:
+            return 0, []
+        total = (await session.execute(select(func.count()).select_from(query.subquery()))).scalar()
+        return total, []
+
+    @classmethod
+    async def estimated_count(cls, session: AsyncSession) -> int:
+        """
+        Estimate the number of users from PostgreSQL planner statistics (`pg_class.reltuples`).
+
+        Falls back to an exact count when the table has never been analyzed or the estimate is
+        below `estimated_count_threshold`, where an exact count is cheap and estimates are noisy.
+        """
+        result = await session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": User.__tablename__},
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate < settings.estimated_count_threshold:
+            return await cls.count(session)
+        return estimate
+
+    @classmethod
+    async def list_users_with_count(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> Tuple[int, List[User]]:
+        """
+        List a page of users along with the total user count.
+
+        :param session: The AsyncSession instance for database access.
+        :return: A tuple containing the total count and the users on the page.
+        """
+        if settings.user_list_count_mode == "estimated":
+            total_users = await cls.estimated_count(session)
+            return total_users, await cls.list_users(session, skip, limit)
+        return await cls._paginate(session, select(User), skip, limit)
+
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
         return await cls.create(session, user_data, get_email_service)
@@ -210,54 +363,94 @@ class UserService:
 
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
+        """
+        Authenticate a user by email and password.
+
+        The user is read once; a locked account is rejected from that same read with a 400.
+        A wrong password is counted by `_record_failed_login`.
+
+        :return: The user, or None if the email is unknown, unverified, or the password is wrong.
+        """
+        user = await cls._fetch_user(session, refresh=True, email=email)
         if user:
+            if user.is_locked:
+                raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
             if user.email_verified is False:
                 return None
-            if user.is_locked:
-                return None # pragma: no cover
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
+            if await verify_password_async(password, user.hashed_password):
+                # Only write when something changed: most logins find the counter at zero and
+                # a last_login_at recent enough to keep
+                changed = False
+                if user.failed_login_attempts:
+                    user.failed_login_attempts = 0
+                    changed = True
+                now = datetime.now(timezone.utc)
+                if user.last_login_at is None or now - user.last_login_at >= timedelta(seconds=settings.login_touch_interval):
+                    user.last_login_at = now
+                    changed = True
+                if changed:
+                    await session.commit()
+                    await cls._invalidate_cached_user(user.id)
                 return user
             else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
+                await cls._record_failed_login(session, user)
         return None
 
+    @classmethod
+    async def _record_failed_login(cls, session: AsyncSession, user: User):
+        """
+        Count a failed login and lock the account at `max_login_attempts`, in one statement.
+
+        The increment happens in the database, so concurrent failures are all counted and the
+        lock is set by exactly the attempt that reaches the limit.
+        """
+        attempts = User.failed_login_attempts + 1
+        result = await session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(failed_login_attempts=attempts, is_locked=or_(User.is_locked, attempts >= settings.max_login_attempts))
+            .returning(User.failed_login_attempts, User.is_locked)
+            .execution_options(synchronize_session=False)
+        )
+        failed_login_attempts, is_locked = result.one()
+        await session.commit()
+        # Keep the loaded instance in step with the row without reading it again
+        set_committed_value(user, "failed_login_attempts", failed_login_attempts)
+        set_committed_value(user, "is_locked", is_locked)
+        await cls._invalidate_cached_user(user.id)
+
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
-        user = await cls.get_by_email(session, email)
+        user = await cls._fetch_user(session, refresh=True, email=email)
         return user.is_locked if user else False
 
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
-        user = await cls.get_by_id(session, user_id)
+        hashed_password = await hash_password_async(new_password)
+        user = await cls._fetch_user(session, refresh=True, id=user_id)
         if user:
             user.hashed_password = hashed_password
             user.failed_login_attempts = 0  # Resetting failed login attempts
             user.is_locked = False  # Unlocking the user account, if locked
             session.add(user)
+            # Sessions started with the old password must log in again
+            await RefreshTokenService.revoke_for_user(session, user.id)
             await session.commit()
+            await cls._invalidate_cached_user(user_id)
             return True
         return False
 
     @classmethod
     async def verify_email_with_token(cls, session: AsyncSession, user_id: UUID, token: str) -> bool:
-        user = await cls.get_by_id(session, user_id)
+        user = await cls._fetch_user(session, refresh=True, id=user_id)
         if user and user.verification_token == token:
             user.email_verified = True
             user.verification_token = None  # Clear the token once used
             user.role = UserRole.AUTHENTICATED
             session.add(user)
             await session.commit()
+            await cls._invalidate_cached_user(user_id)
             return True
         return False
 
@@ -276,23 +469,25 @@ class UserService:
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
+        user = await cls._fetch_user(session, refresh=True, id=user_id)
         if user and user.is_locked:
             user.is_locked = False
             user.failed_login_attempts = 0  # Optionally reset failed login attempts
             session.add(user)
             await session.commit()
+            await cls._invalidate_cached_user(user_id)
             return True
         return False
     
     @classmethod
     async def anonymize_user(cls, session: AsyncSession, user_id: UUID):
-        user = await cls.get_by_id(session, user_id) # pragma: no cover
-        if user: # pragma: no cover
-            user.anonymize() # pragma: no cover
-            session.add(user) # pragma: no cover
-            await session.commit() # pragma: no cover
-            return user # pragma: no cover
+        user = await cls._fetch_user(session, refresh=True, id=user_id)
+        if user:
+            user.anonymize()
+            session.add(user)
+            await session.commit()
+            await cls._invalidate_cached_user(user_id)
+            return user
         return None
 
     @classmethod
@@ -310,9 +505,9 @@ class UserService:
 
         # Apply filters
         if filters.get("username"):
-            query = query.where(User.nickname.ilike(f"%{filters['username']}%"))
+            query = query.where(cls._text_match(User.nickname, filters["username"], filters.get("match")))
         if filters.get("email"):
-            query = query.where(User.email.ilike(f"%{filters['email']}%"))
+            query = query.where(cls._text_match(User.email, filters["email"], filters.get("match")))
         if filters.get("role"):
             query = query.where(User.role == filters["role"])
         if filters.get("is_locked") is not None:
@@ -322,14 +517,8 @@ class UserService:
         if filters.get("registration_date_end"):
             query = query.where(User.created_at <= filters["created_to"])
 
-        # Count total users matching the criteria
-        total_users = (await session.execute(select(func.count()).select_from(query.subquery()))).scalar()
-
-        # Add pagination
-        result = await session.execute(query.offset(skip).limit(limit))
-        users = result.scalars().all()
-
-        return total_users, users
+        # Fetch the page and the total matching count in one query
+        return await cls._paginate(session, query, skip, limit)
 
 
 
@@ -342,14 +531,40 @@ class UserService:
         :param filters: Dictionary containing dynamic search filters.
         :return: A tuple containing the total count and a list of users matching the criteria.
         """
-        query = select(User)
+        query = cls._apply_search_filters(select(User), filters)
+
+        # Fetch the page and the total matching count in one query
+        skip = filters.get("skip", 0)
+        limit = filters.get("limit", 10)
+        return await cls._paginate(session, query, skip, limit)
+
+
+
+    @classmethod
+    def _text_match(cls, column, value: str, match: Optional[str] = None):
+        """
+        Build an index-friendly, case-insensitive text match for `column`.
 
-        # Apply filters dynamically
+        - "prefix": `lower(column) LIKE 'value%'`, served by the `text_pattern_ops` indexes.
+        - "contains" (default): `column ILIKE '%value%'`, served by the `pg_trgm` GIN indexes.
+
+        LIKE wildcards in `value` are escaped (with PostgreSQL's default backslash escape) so
+        user input is always matched literally.
+        """
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        if match == "prefix":
+            return func.lower(column).like(f"{escaped.lower()}%")
+        return column.ilike(f"%{escaped}%")
+
+    @classmethod
+    def _apply_search_filters(cls, query, filters: Dict):
+        """Apply the dynamic search filters shared by advanced and cursor-based search."""
+        match = filters.get("match")
         for field, value in filters.items():
            if field == "username" and value:
-               query = query.where(User.nickname.ilike(f"%{value}%"))
+               query = query.where(cls._text_match(User.nickname, value, match))
            elif field == "email" and value:
-                 query = query.where(User.email.ilike(f"%{value}%"))
+                 query = query.where(cls._text_match(User.email, value, match))
            elif field == "role" and value:
                  query = query.where(User.role == value)
            elif field == "is_locked" and value is not None:
@@ -358,42 +573,229 @@ class UserService:
             query = query.where(User.created_at >= value)
            elif field == "created_to" and value:
             query = query.where(User.created_at <= value)
+        return query
 
-        # Count total users matching the criteria
-        total_query = select(func.count()).select_from(query.subquery())
-        total_result = await session.execute(total_query)
-        total_users = total_result.scalar()
+    @classmethod
+    async def _paginate_keyset(cls, session: AsyncSession, query, cursor: Optional[str], limit: int) -> Tuple[List[User], Optional[str], Optional[str]]:
+        """
+        Fetch one page of `query` using keyset pagination on `(created_at, id)`.
 
-        # Add pagination
-        skip = filters.get("skip", 0)
-        limit = filters.get("limit", 10)
-        result = await session.execute(query.offset(skip).limit(limit))
-        users = result.scalars().all()
+        An empty or missing cursor starts at the first page. The cost of a page is independent
+        of how deep it is, because the position is a range predicate on the ordering key
+        instead of an offset.
 
-        return total_users, users
+        :return: A tuple of the users on the page, the `next` cursor and the `prev` cursor.
+        :raises ValueError: If the cursor is malformed.
+        """
+        key = tuple_(User.created_at, User.id)
+        direction = CURSOR_NEXT
+        has_position = bool(cursor)
+        if has_position:
+            created_at, user_id, direction = decode_cursor(cursor)
+            position = tuple_(created_at, user_id)
+            query = query.where(key < position if direction == CURSOR_PREV else key > position)
+
+        if direction == CURSOR_PREV:
+            query = query.order_by(User.created_at.desc(), User.id.desc())
+        else:
+            query = query.order_by(User.created_at.asc(), User.id.asc())
+
+        # Fetch one extra row to learn whether another page exists in this direction
+        users = list((await session.execute(query.limit(limit + 1))).scalars().all())
+        has_more = len(users) > limit
+        users = users[:limit]
+        if direction == CURSOR_PREV:
+            users.reverse()
+        if not users:
+            return users, None, None
+
+        first, last = users[0], users[-1]
+        more_after = has_more if direction == CURSOR_NEXT else has_position
+        more_before = has_position if direction == CURSOR_NEXT else has_more
+        next_cursor = encode_cursor(last.created_at, last.id, CURSOR_NEXT) if more_after else None
+        prev_cursor = encode_cursor(first.created_at, first.id, CURSOR_PREV) if more_before else None
+        return users, next_cursor, prev_cursor
 
+    @classmethod
+    async def list_users_by_cursor(cls, session: AsyncSession, cursor: Optional[str], limit: int = 10) -> Tuple[Optional[int], List[User], Optional[str], Optional[str]]:
+        """
+        List users with keyset pagination.
 
+        A page is a single query. The total is only reported when `user_list_count_mode` is
+        'estimated', where it comes from planner statistics; an exact count would scan every
+        row on every page, which is what keyset pagination avoids.
 
-    def generate_unique_nickname(session) -> str:
-        while True: # pragma: no cover
-            nickname = generate_nickname() # pragma: no cover
-            if not session.query(User).filter_by(nickname=nickname).first(): # pragma: no cover
-                return nickname # pragma: no cover
+        :return: A tuple of the total count (or None), the users on the page, and the `next`/`prev` cursors.
+        """
+        total_users = None
+        if settings.user_list_count_mode == "estimated":
+            total_users = await cls.estimated_count(session)
+        users, next_cursor, prev_cursor = await cls._paginate_keyset(session, select(User), cursor, limit)
+        return total_users, users, next_cursor, prev_cursor
+
+    @classmethod
+    async def search_users_by_cursor(cls, session: AsyncSession, filters: Dict, cursor: Optional[str], limit: int = 10) -> Tuple[Optional[int], List[User], Optional[str], Optional[str]]:
+        """
+        Search users with the advanced filters using keyset pagination.
+
+        A page is a single query; no total is reported, since counting the matches would scan
+        all of them on every page.
+
+        :return: A tuple of None for the total, the users on the page, and the `next`/`prev` cursors.
+        """
+        query = cls._apply_search_filters(select(User), filters)
+        users, next_cursor, prev_cursor = await cls._paginate_keyset(session, query, cursor, limit)
+        return None, users, next_cursor, prev_cursor
+
+    @classmethod
+    async def bulk_import(cls, session: AsyncSession, rows: List[Dict], email_service: EmailService, chunk_size: int = 1000) -> List[Dict]:
+        """
+        Import many users at once.
+
+        Rows are validated up front, then processed in chunks: one set-based query finds
+        existing emails and nicknames, passwords are hashed in parallel on the hashing pool,
+        and the chunk is written with a single `INSERT ... ON CONFLICT DO NOTHING RETURNING`
+        together with the users' verification emails, then committed.
+
+        :param rows: Dictionaries with `UserCreate` fields.
+        :param chunk_size: Users per insert statement and transaction.
+        :return: One result per input row, in order, with `row`, `email`, `status`
+                 ("created", "duplicate", "invalid" or "error"), `id` and `detail`.
+        """
+        results = [
+            {"row": index + 1, "email": row.get("email") if isinstance(row, dict) else None, "status": None, "id": None, "detail": None}
+            for index, row in enumerate(rows)
+        ]
+        candidates = []
+        batch_emails, batch_nicknames = set(), set()
+        for index, row in enumerate(rows):
+            try:
+                validated_data = UserCreate(**row).model_dump()
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+                results[index].update(status="invalid", detail=detail)
+                continue
+            except TypeError:
+                results[index].update(status="invalid", detail="Row must be an object")
+                continue
+            nickname = validated_data.get("nickname")
+            if validated_data["email"] in batch_emails or (nickname and nickname in batch_nicknames):
+                results[index].update(status="duplicate", detail="Email or nickname repeated within the import.")
+                continue
+            batch_emails.add(validated_data["email"])
+            if nickname:
+                batch_nicknames.add(nickname)
+            candidates.append((index, validated_data))
+
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            try:
+                await cls._import_chunk(session, chunk, results, email_service, batch_nicknames)
+            except SQLAlchemyError as e:
+                logger.error("Database error during user import: %s", e)
+                await session.rollback()
+                for index, _ in chunk:
+                    results[index].update(status="error", id=None, detail="Database error while importing this row.")
+        email_service.notify_outbox()
+        return results
+
+    @classmethod
+    async def _import_chunk(cls, session: AsyncSession, chunk: List[Tuple[int, Dict]], results: List[Dict], email_service: EmailService, reserved_nicknames: set):
+        """Insert one chunk of validated rows for `bulk_import`, recording each row's outcome."""
+        emails = [data["email"] for _, data in chunk]
+        nicknames = [data["nickname"] for _, data in chunk if data.get("nickname")]
+        existing = await session.execute(
+            select(User.email, User.nickname).where(or_(User.email.in_(emails), User.nickname.in_(nicknames)))
+        )
+        taken_emails, taken_nicknames = set(), set()
+        for email, nickname in existing:
+            taken_emails.add(email)
+            taken_nicknames.add(nickname)
+
+        pending = []
+        for index, data in chunk:
+            if data["email"] in taken_emails:
+                results[index].update(status="duplicate", detail="Email already exists.")
+            elif data.get("nickname") in taken_nicknames:
+                results[index].update(status="duplicate", detail="Nickname already exists.")
+            else:
+                pending.append((index, data))
+
+        unassigned = await cls._assign_nicknames(session, [data for _, data in pending if not data.get("nickname")], reserved_nicknames)
+        for index, data in pending:
+            if id(data) in unassigned:
+                results[index].update(status="error", detail="Could not generate a unique nickname.")
+        pending = [(index, data) for index, data in pending if id(data) not in unassigned]
+        if not pending:
+            return
+
+        hashed_passwords = await hash_passwords_async([data.pop("password") for _, data in pending])
+        values = []
+        for (_, data), hashed_password in zip(pending, hashed_passwords):
+            values.append({
+                **data,
+                "id": uuid4(),
+                "hashed_password": hashed_password,
+                "role": UserRole.ANONYMOUS,
+                "verification_token": generate_verification_token(),
+                "email_verified": False,
+                "is_locked": False,
+                "is_professional": False,
+                "failed_login_attempts": 0,
+            })
+
+        statement = pg_insert(User).values(values).on_conflict_do_nothing().returning(User.id)
+        inserted_ids = set((await session.execute(statement)).scalars().all())
+        for (index, _), user_values in zip(pending, values):
+            if user_values["id"] in inserted_ids:
+                results[index].update(status="created", id=user_values["id"])
+                await email_service.queue_verification_email(session, User(**user_values))
+            else:
+                # Lost a race with a concurrent insert of the same email or nickname
+                results[index].update(status="duplicate", detail="Email or nickname already exists.")
+        await session.commit()
+
+    @classmethod
+    async def _assign_nicknames(cls, session: AsyncSession, rows: List[Dict], reserved: set) -> set:
+        """
+        Give each row a generated nickname not used in the database or in `reserved`.
+
+        :return: The `id()` of rows that could not be assigned a nickname.
+        """
+        nicknames = await cls.allocate_nicknames(session, len(rows), reserved)
+        for data, nickname in zip(rows, nicknames):
+            data["nickname"] = nickname
+            reserved.add(nickname)
+        return {id(data) for data in rows[len(nicknames):]}
+
+    @classmethod
+    async def allocate_nicknames(cls, session: AsyncSession, count: int, reserved: frozenset = frozenset()) -> List[str]:
+        """
+        Generate up to `count` nicknames that are not used in the database or in `reserved`.
+
+        Each round proposes candidates for every missing nickname, at least
+        `settings.nickname_batch_size` of them, and checks them all with a single
+        `WHERE nickname IN (...)` query. Fewer than `count` nicknames are returned only if
+        `NICKNAME_ATTEMPTS` rounds were not enough.
+        """
+        allocated = []
+        for _ in range(NICKNAME_ATTEMPTS):
+            missing = count - len(allocated)
+            if missing <= 0:
+                break
+            candidates = [
+                nickname for nickname in generate_nicknames(max(missing, settings.nickname_batch_size))
+                if nickname not in reserved and nickname not in allocated
+            ]
+            taken = set((await session.execute(select(User.nickname).where(User.nickname.in_(candidates)))).scalars().all())
+            allocated.extend([nickname for nickname in candidates if nickname not in taken][:missing])
+        return allocated
 
     @classmethod
     async def is_nickname_unique(cls, session: AsyncSession, nickname: str) -> bool:
         existing_user = await cls.get_by_nickname(session, nickname) # pragma: no cover
         return existing_user is None # pragma: no cover
 
-    async def anonymize_user(cls, session: AsyncSession, user_id: UUID):
-        user = await cls.get_by_id(session, user_id)
-        if user:
-            user.anonymize()
-            session.add(user)
-            await session.commit()
-            return user
-        return None
-
     @classmethod
     async def is_nickname_unique(cls, session: AsyncSession, nickname: str) -> bool:
         existing_user = await cls.get_by_nickname(session, nickname) # pragma: no cover
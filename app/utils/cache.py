@@ -0,0 +1,123 @@
+from builtins import ImportError, NotImplementedError, RuntimeError, TypeError, dict, int, isinstance, len, max, str, type
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+class CacheBackend:
+    """
+    Storage interface for small JSON-like cache entries (dicts of column values).
+
+    Implementations must treat a missing or expired key as a miss (`None`).
+    """
+    async def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: dict):
+        raise NotImplementedError
+
+    async def delete(self, *keys: str):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        """Number of stored entries, if the backend can tell cheaply."""
+        return None
+
+class LRUCache(CacheBackend):
+    """
+    In-process cache holding at most `max_size` entries, each for `ttl` seconds.
+
+    The least recently used entry is evicted when full. Entries are not shared between
+    worker processes, so another process may serve a changed user for up to `ttl` seconds.
+    """
+    def __init__(self, max_size: int = 10000, ttl: float = 30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+def _json_default(value: Any):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in Redis (or any server speaking its protocol), shared by all workers.
+
+    `client` is an asyncio Redis client such as `redis.asyncio.Redis`; anything with async
+    `get`, `set(key, value, ex=...)`, `delete(*keys)` and `scan_iter(match=...)` works.
+    Values are stored as JSON, so UUIDs, datetimes and enums come back as strings.
+    """
+    def __init__(self, client, ttl: float = 30, prefix: str = "user-cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict):
+        await self.client.set(self.prefix + key, json.dumps(value, default=_json_default), ex=max(1, int(self.ttl)))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self):
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+def create_cache_backend(backend: str, max_size: int, ttl: float, redis_url: Optional[str] = None) -> Optional[CacheBackend]:
+    """
+    Build the backend named by `backend` ("memory", "redis" or "none").
+
+    Returns None for "none". The "redis" backend needs the optional `redis` package.
+    """
+    if backend == "none":
+        return None
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' cache backend requires the 'redis' package") from e
+        return RedisCache(redis.from_url(redis_url), ttl=ttl)
+    return LRUCache(max_size=max_size, ttl=ttl)
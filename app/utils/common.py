@@ -1,16 +1,32 @@
+import logging
 import logging.config
 import os
 from app.dependencies import get_settings
+from app.utils.structured_logging import RequestIdFilter, start_log_queue, stop_log_queue
 
 settings = get_settings()
 def setup_logging():
     """
     Sets up logging for the application using a configuration file.
     This ensures standardized logging across the entire application.
+
+    Every record carries the id of the request it was logged for. With `log_async` the
+    configured handlers are fed through a queue and run on a background thread; call
+    `shutdown_logging` to write out what is still queued.
     """
+    # The configuration below closes the current handlers, so stop the thread using them first
+    stop_log_queue()
     # Construct the path to 'logging.conf', assuming it's in the project's root.
     logging_config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'logging.conf')
     # Normalize the path to handle any '..' correctly.
     normalized_path = os.path.normpath(logging_config_path)
     # Apply the logging configuration.
-    logging.config.fileConfig(normalized_path, disable_existing_loggers=False)
\ No newline at end of file
+    logging.config.fileConfig(normalized_path, disable_existing_loggers=False)
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(RequestIdFilter())
+    if settings.log_async:
+        start_log_queue()
+
+def shutdown_logging():
+    """Write out queued log records and stop the logging thread."""
+    stop_log_queue()
@@ -0,0 +1,211 @@
+from builtins import NotImplementedError, ValueError, float, int, isinstance, len, list, str, super, zip
+import math
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds, from 1ms up to 10s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def format_value(value) -> str:
+    """Format a sample value the way the Prometheus text format expects."""
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(int(value))
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render label pairs without the surrounding braces, e.g. `method="GET",route="/users/"`."""
+    return ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+
+def _with_labels(name: str, labels: str) -> str:
+    return f"{name}{{{labels}}}" if labels else name
+
+def metric_header(name: str, documentation: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+
+def sample_lines(name: str, documentation: str, metric_type: str, value) -> List[str]:
+    """Exposition lines for a single unlabeled gauge or counter read at scrape time."""
+    return metric_header(name, documentation, metric_type) + [f"{name} {format_value(value)}"]
+
+class Histogram:
+    """
+    Minimal cumulative histogram in the style of a Prometheus histogram.
+
+    Observations are counted into the first bucket whose upper bound is greater than or
+    equal to the value; values above the largest bound are only reflected in `count`/`sum`.
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self._counts):
+                self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """Return cumulative bucket counts along with the total count and sum."""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for count in self._counts:
+                running += count
+                cumulative.append(running)
+            return {
+                "buckets": {str(bound): total for bound, total in zip(self.buckets, cumulative)},
+                "count": self._count,
+                "sum": self._sum,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self._sum = 0.0
+            self._count = 0
+
+    def samples(self, name: str, labels: str = "") -> List[str]:
+        """Exposition lines (`_bucket`, `_sum`, `_count`) for this histogram under `name`."""
+        snapshot = self.snapshot()
+        prefix = labels + "," if labels else ""
+        lines = [
+            f'{name}_bucket{{{prefix}le="{format_value(float(bound))}"}} {total}'
+            for bound, total in zip(self.buckets, snapshot["buckets"].values())
+        ]
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {snapshot["count"]}')
+        lines.append(f"{_with_labels(name + '_sum', labels)} {format_value(float(snapshot['sum']))}")
+        lines.append(f"{_with_labels(name + '_count', labels)} {snapshot['count']}")
+        return lines
+
+class Counter:
+    """A value that only goes up."""
+    def __init__(self):
+        self._value = 0.0
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+    def samples(self, name: str, labels: str = "") -> List[str]:
+        return [f"{_with_labels(name, labels)} {format_value(self._value)}"]
+
+    def reset(self):
+        with self._lock:
+            self._value = 0.0
+
+class Gauge(Counter):
+    """A value that goes up and down, such as the number of requests in flight."""
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = float(value)
+
+class MetricFamily:
+    """
+    A named metric with a fixed set of label names and one child per combination of label values.
+
+    `labels(*values)` returns the child for those values, creating it on first use, so the hot
+    path is a dict lookup keyed by the values tuple: no label dict is built per observation,
+    and each child's label string is rendered once. Label values must come from a small,
+    bounded set (route templates, not raw paths).
+    """
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Tuple[str, object]] = {}
+        self._lock = Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, (format_labels(self.label_names, values), self._new_child()))
+        return child[1]
+
+    def collect(self) -> List[str]:
+        lines = metric_header(self.name, self.documentation, self.metric_type)
+        for labels, child in list(self._children.values()):
+            lines.extend(child.samples(self.name, labels))
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._children = {}
+
+class CounterFamily(MetricFamily):
+    metric_type = "counter"
+
+    def _new_child(self) -> Counter:
+        return Counter()
+
+class GaugeFamily(MetricFamily):
+    metric_type = "gauge"
+
+    def _new_child(self) -> Gauge:
+        return Gauge()
+
+class HistogramFamily(MetricFamily):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, label_names, registry=registry)
+
+    def _new_child(self) -> Histogram:
+        return Histogram(self.buckets)
+
+class Registry:
+    """
+    The metrics served on `/metrics`: registered families, plus collectors that read values
+    kept elsewhere (pool status, cache statistics) when scraped.
+
+    Every worker process has its own registry, so each scrape reports one worker.
+    """
+    def __init__(self):
+        self._families: List[MetricFamily] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, family: MetricFamily):
+        self._families.append(family)
+
+    def register_collector(self, collector: Callable[[], List[str]]):
+        """Add a function returning exposition lines, called on every scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for family in self._families:
+            lines.extend(family.collect())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
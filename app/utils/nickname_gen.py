@@ -1,13 +1,63 @@
-from builtins import str
-import random
+from builtins import int, len, list, set, str
+import secrets
+from typing import List, Optional
+from settings.config import settings
 
-def generate_nickname(separator: str = "-") -> str:
+# Words are lowercase ASCII and at most 9 characters, so a nickname with an 8-digit
+# suffix still fits the 30-character limit enforced by validate_nickname
+ADJECTIVES = (
+    "agile", "amber", "ancient", "arctic", "azure", "bold", "brave", "breezy",
+    "bright", "brisk", "calm", "candid", "cheerful", "clever", "cosmic", "cozy",
+    "crimson", "crisp", "curious", "daring", "dancing", "dapper", "dazzling", "eager",
+    "earnest", "electric", "elegant", "epic", "fancy", "fearless", "fiery", "flying",
+    "fluffy", "frosty", "gallant", "gentle", "gleaming", "golden", "graceful", "grand",
+    "happy", "hardy", "hidden", "humble", "icy", "jade", "jolly", "jovial",
+    "jumping", "keen", "kind", "lively", "lucky", "lunar", "magic", "majestic",
+    "mellow", "merry", "mighty", "misty", "modest", "nimble", "noble", "oaken",
+    "patient", "peaceful", "plucky", "polar", "proud", "quick", "quiet", "radiant",
+    "rapid", "rustic", "scarlet", "serene", "shiny", "silent", "silver", "sleek",
+    "smooth", "snowy", "solar", "sonic", "sparkly", "speedy", "spirited", "steady",
+    "stellar", "stormy", "sturdy", "sunny", "swift", "tidy", "tranquil", "trusty",
+    "upbeat", "valiant", "velvet", "vivid", "wandering", "warm", "whimsical", "wild",
+    "windy", "wise", "witty", "zealous", "zesty", "zippy", "bouncy", "cobalt",
+    "dusky", "emerald", "fabled", "gusty", "hazel", "indigo", "ivory", "lavish",
+    "maroon", "nifty", "olive", "pearly", "rosy", "sandy", "tawny", "umber",
+)
+NOUNS = (
+    "albatross", "alpaca", "antelope", "badger", "beaver", "bison", "bobcat", "buffalo",
+    "camel", "canary", "caribou", "cheetah", "condor", "cougar", "coyote", "crane",
+    "dingo", "dolphin", "dove", "dragon", "eagle", "egret", "elk", "falcon",
+    "ferret", "finch", "fox", "gazelle", "gecko", "gibbon", "giraffe", "gopher",
+    "griffin", "grouse", "gull", "hare", "hawk", "hedgehog", "heron", "hippo",
+    "hornet", "husky", "ibis", "iguana", "impala", "jackal", "jaguar", "kestrel",
+    "kiwi", "koala", "lemur", "leopard", "lion", "llama", "lynx", "macaw",
+    "magpie", "mammoth", "manatee", "marmot", "marten", "meerkat", "mink", "moose",
+    "narwhal", "newt", "ocelot", "octopus", "orca", "osprey", "otter", "owl",
+    "panda", "panther", "parrot", "pelican", "penguin", "phoenix", "pika", "plover",
+    "puffin", "puma", "quail", "quokka", "rabbit", "raccoon", "raven", "reindeer",
+    "robin", "salmon", "seal", "shark", "sparrow", "sphinx", "squid", "stoat",
+    "stork", "swan", "tapir", "tiger", "toucan", "turtle", "unicorn", "viper",
+    "vulture", "walrus", "weasel", "whale", "wolf", "wombat", "wren", "yak",
+    "zebra", "bear", "cobra", "coral", "crow", "eel", "bunting", "goose",
+    "ibex", "jay", "kite", "lark", "mole", "moth", "oriole", "pony",
+)
+
+def generate_nickname(separator: str = "-", suffix_length: Optional[int] = None) -> str:
     """
-    Generate a URL-safe nickname using a mix of adjectives, verbs, nouns, and a 3-digit number.
+    Generate a URL-safe nickname from an adjective, a noun and a zero-padded numeric suffix.
     Allows choosing a separator (default: hyphen).
+
+    `suffix_length` (default: `settings.nickname_suffix_length`) sets the number of digits;
+    each extra digit makes the space of about 16,000 word pairs ten times larger.
     """
-    words = ["clever", "jolly", "jumping", "brave", "flying", "gentle", "dancing"]
-    nouns = ["panda", "fox", "tiger", "dolphin", "dragon", "lion", "eagle", "whale"]
-    number = random.randint(100, 999)  # Ensures 3-digit format for uniqueness
-    
-    return f"{random.choice(words)}{separator}{random.choice(nouns)}{separator}{number}"
+    if suffix_length is None:
+        suffix_length = settings.nickname_suffix_length
+    number = secrets.randbelow(10 ** suffix_length)
+    return f"{secrets.choice(ADJECTIVES)}{separator}{secrets.choice(NOUNS)}{separator}{number:0{suffix_length}d}"
+
+def generate_nicknames(count: int, separator: str = "-", suffix_length: Optional[int] = None) -> List[str]:
+    """Generate `count` distinct nicknames, so a batch of candidates can be checked in one query."""
+    nicknames = set()
+    while len(nicknames) < count:
+        nicknames.add(generate_nickname(separator, suffix_length))
+    return list(nicknames)
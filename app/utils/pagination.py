@@ -1,12 +1,63 @@
-from typing import List
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
 from fastapi import Request
 from app.schemas.pagination_schema import PaginationLink
 from app.utils.link_generation import create_pagination_link
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+def encode_cursor(created_at: datetime, user_id: UUID, direction: str = CURSOR_NEXT) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor.
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(user_id), "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID, str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = payload["d"]
+        if direction not in (CURSOR_NEXT, CURSOR_PREV):
+            raise ValueError(f"Unknown cursor direction: {direction}")
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"]), direction
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def generate_pagination_links(
+    request: Request,
+    skip: int,
+    limit: int,
+    total_items: Optional[int],
+    next_cursor: Optional[str] = None,
+    prev_cursor: Optional[str] = None,
+    cursor_mode: bool = False,
+) -> List[PaginationLink]:
     """
     Generate pagination links for API responses.
+
+    In cursor mode (or when cursors are given) the links are `self` plus `next`/`prev`
+    cursor links; offset-based `first`/`last` links would need the total and do not
+    address keyset pages.
     """
+    if cursor_mode or next_cursor is not None or prev_cursor is not None:
+        links = [PaginationLink(rel="self", href=str(request.url))]
+        if next_cursor is not None:
+            links.append(PaginationLink(rel="next", href=str(request.url.include_query_params(cursor=next_cursor, limit=limit))))
+        if prev_cursor is not None:
+            links.append(PaginationLink(rel="prev", href=str(request.url.include_query_params(cursor=prev_cursor, limit=limit))))
+        return links
+
     base_url = str(request.url)  # Use the complete URL from the request
     total_pages = (total_items + limit - 1) // limit
 
@@ -0,0 +1,99 @@
+from builtins import ImportError, NotImplementedError, RuntimeError, float, int, len, max, min, str
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+class RateLimiter:
+    """
+    Allows at most `limit` hits per key in any `window` seconds, on average.
+
+    `hit` records an attempt and returns 0 when it is allowed, or the number of seconds
+    to wait before the key may try again.
+    """
+    async def hit(self, key: str) -> float:
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+class TokenBucketLimiter(RateLimiter):
+    """
+    In-process token buckets: each key holds up to `limit` tokens, refilled at
+    `limit / window` per second, and every hit spends one.
+
+    Buckets live in this worker only, so with N workers a key can make up to N times
+    `limit` attempts. At most `max_keys` buckets are kept; the least recently hit is
+    dropped first, which only forgets keys that have been quiet the longest.
+    """
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.rate = limit / window
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.limit, now))
+        tokens = min(self.limit, tokens + (now - updated_at) * self.rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def clear(self):
+        self._buckets.clear()
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Fixed-window counters in Redis, shared by all workers.
+
+    `client` is an asyncio Redis client; anything with `pipeline(transaction=True)` (running
+    `incr` and `ttl`), async `expire`, `delete(*keys)` and `scan_iter(match=...)` works. The
+    window starts at a key's first hit, and the key expires with it.
+    """
+    def __init__(self, client, limit: int, window: float, prefix: str = "rate-limit:"):
+        self.client = client
+        self.limit = limit
+        self.window = max(1, int(window))
+        self.prefix = prefix
+
+    async def hit(self, key: str) -> float:
+        key = self.prefix + key
+        # One MULTI/EXEC, so the TTL read belongs to the counter this INCR produced
+        async with self.client.pipeline(transaction=True) as pipe:
+            count, ttl = await pipe.incr(key).ttl(key).execute()
+        if ttl < 0:
+            # A new counter, or one whose expiry was never set (e.g. the process died right
+            # after creating it): start its window now, so no counter can outlive one window
+            await self.client.expire(key, self.window)
+            ttl = self.window
+        if count <= self.limit:
+            return 0.0
+        return float(max(1, ttl))
+
+    async def clear(self):
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+def create_rate_limiter(backend: str, limit: int, window: float, max_keys: int, redis_url: Optional[str] = None, prefix: str = "rate-limit:") -> Optional[RateLimiter]:
+    """
+    Build the limiter named by `backend` ("memory", "redis" or "none").
+
+    Returns None for "none" or a `limit` of 0. The "redis" backend needs the optional `redis` package.
+    """
+    if backend == "none" or limit <= 0:
+        return None
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' rate limit backend requires the 'redis' package") from e
+        return RedisRateLimiter(redis.from_url(redis_url), limit, window, prefix=prefix)
+    return TokenBucketLimiter(limit, window, max_keys=max_keys)
@@ -0,0 +1,52 @@
+from builtins import getattr, str
+import time
+from app.utils.metrics import REGISTRY, GaugeFamily, HistogramFamily
+
+# Requests that matched no route share one label value, so unknown paths cannot add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+request_time = HistogramFamily(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, by method, route template and status code.",
+    ("method", "route", "status"),
+    registry=REGISTRY,
+)
+requests_in_flight = GaugeFamily(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    registry=REGISTRY,
+).labels()
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording the latency, status code and in-flight count of every HTTP request.
+
+    Requests are labelled with the template of the route that served them (`/users/{user_id}`),
+    which the router stores in the scope, so the number of series stays bounded. It is plain
+    ASGI rather than `BaseHTTPMiddleware` to avoid running the app in a separate task.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # If the app fails before responding, the server answers 500
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            request_time.labels(scope["method"], route_path, str(status_code)).observe(elapsed)
@@ -1,12 +1,35 @@
 # app/security.py
-from builtins import Exception, ValueError, bool, int, str
+from builtins import Exception, ValueError, bool, int, max, str
+import asyncio
 import secrets
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import bcrypt
+import time
+from fastapi import HTTPException, status
 from logging import getLogger
+from app.utils.metrics import REGISTRY, HistogramFamily
+from settings.config import settings
 
 # Set up logging
 logger = getLogger(__name__)
 
+# Shared executor for bcrypt work, created lazily on first use
+_hash_executor: Optional[Executor] = None
+# Jobs submitted to the executor and not yet finished, running or waiting for a worker
+_hash_jobs_in_flight = 0
+# Passwords hashed per bulk job: about a second of work at cost 12, so a worker is never held long
+BULK_HASH_JOB_SIZE = 4
+# Limits bulk jobs to fewer workers than the pool has; created per event loop, as semaphores bind to one
+_bulk_hash_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+hash_time = HistogramFamily(
+    "password_hash_duration_seconds",
+    "Time from submitting a bcrypt job to its result, including time queued for a worker, by function.",
+    ("operation",),
+    registry=REGISTRY,
+)
+
 def hash_password(password: str, rounds: int = 12) -> str:
     """
     Hashes a password using bcrypt with a specified cost factor.
@@ -49,6 +72,109 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+def get_hash_executor() -> Executor:
+    """
+    Returns the executor used for password hashing, creating it on first use.
+
+    The pool type and size come from settings. Threads are the default because bcrypt
+    releases the GIL while hashing; a process pool can be selected instead.
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.password_hash_pool == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt")
+    return _hash_executor
+
+def shutdown_hash_executor():
+    """Shuts down the password hashing executor, if it was started."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Runs a blocking bcrypt call on the hashing executor without blocking the event loop.
+
+    Raises:
+        HTTPException: 503 when the number of jobs waiting for a free worker reaches
+            `password_hash_max_pending`. Jobs already running on a worker are not counted.
+    """
+    global _hash_jobs_in_flight
+    # The executor runs up to `password_hash_workers` jobs at once; the rest wait in its queue
+    queued = _hash_jobs_in_flight - settings.password_hash_workers
+    if queued >= settings.password_hash_max_pending:
+        logger.warning("Password hashing pool saturated (%s queued jobs)", queued)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+    _hash_jobs_in_flight += 1
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _hash_jobs_in_flight -= 1
+        hash_time.labels(func.__name__).observe(time.perf_counter() - start)
+
+async def hash_password_async(password: str, rounds: int = 12) -> str:
+    """
+    Async variant of `hash_password` that runs on the bounded hashing pool.
+
+    Raises:
+        ValueError: If hashing the password fails.
+        HTTPException: 503 if the hashing pool is saturated.
+    """
+    return await _run_in_hash_pool(hash_password, password, rounds)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Async variant of `verify_password` that runs on the bounded hashing pool.
+
+    Raises:
+        ValueError: If the hashed password format is incorrect or the function fails to verify.
+        HTTPException: 503 if the hashing pool is saturated.
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+def _hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    """Hash a list of passwords in one worker job."""
+    return [hash_password(password, rounds) for password in passwords]
+
+def _get_bulk_hash_slots() -> asyncio.Semaphore:
+    """Return the running loop's semaphore for bulk jobs, which leaves at least half the workers free."""
+    global _bulk_hash_slots
+    loop = asyncio.get_running_loop()
+    if _bulk_hash_slots is None or _bulk_hash_slots[0] is not loop:
+        _bulk_hash_slots = (loop, asyncio.Semaphore(max(1, settings.password_hash_workers // 2)))
+    return _bulk_hash_slots[1]
+
+async def _hash_bulk_job(passwords: List[str], rounds: int) -> List[str]:
+    async with _get_bulk_hash_slots():
+        return await _run_in_hash_pool(_hash_passwords, passwords, rounds)
+
+async def hash_passwords_async(passwords: List[str], rounds: int = 12) -> List[str]:
+    """
+    Hash many passwords on the hashing pool, preserving input order.
+
+    The passwords are hashed in jobs of `BULK_HASH_JOB_SIZE`, and at most half the workers
+    (at least one) run bulk jobs at a time. Logins and registrations therefore keep free
+    workers, and wait for at most one short job, however large the import.
+
+    Raises:
+        ValueError: If hashing a password fails.
+        HTTPException: 503 if the hashing pool is saturated.
+    """
+    if not passwords:
+        return []
+    jobs = [passwords[i:i + BULK_HASH_JOB_SIZE] for i in range(0, len(passwords), BULK_HASH_JOB_SIZE)]
+    results = await asyncio.gather(*(_hash_bulk_job(job, rounds) for job in jobs))
+    return [hashed for job in results for hashed in job]
+
 def generate_verification_token():
     """
     Generates a secure 16-byte URL-safe token for verification purposes.
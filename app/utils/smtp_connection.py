@@ -1,17 +1,104 @@
 # smtp_client.py
-from builtins import Exception, int, str
+from builtins import ConnectionError, Exception, int, max, str
 import smtplib
+import threading
+import time
+from collections import deque
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from settings.config import settings
 import logging
 
+logger = logging.getLogger(__name__)
+
 class SMTPClient:
-    def __init__(self, server: str, port: int, username: str, password: str):
+    """
+    SMTP client that keeps a small pool of authenticated connections for reuse.
+
+    Connections are opened lazily (connect, STARTTLS, LOGIN) and returned to the pool after
+    each message. Connections idle for longer than `idle_timeout` seconds are closed, both
+    when the pool is next used and by a background reaper thread, so they are not left open
+    on the server after traffic stops. A message that fails because a pooled connection was
+    dropped is retried once on a fresh connection; errors reported by the server are not.
+    """
+    def __init__(self, server: str, port: int, username: str, password: str,
+                 pool_size: int = 2, idle_timeout: float = 60, timeout: float = 10):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = deque()  # (connection, last_used) pairs, most recently used last
+        self._idle_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._reaper = None
+        self._stopped = threading.Event()
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            connection.starttls()  # Use TLS
+            connection.login(self.username, self.password)
+        except Exception:
+            self._discard(connection)
+            raise
+        return connection
+
+    def _discard(self, connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def _take_idle(self):
+        """Pop the most recently used idle connection, closing any that have expired."""
+        now = time.monotonic()
+        expired = []
+        connection = None
+        with self._idle_lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                connection = candidate
+                break
+        for stale in expired:
+            self._discard(stale)
+        return connection
+
+    def _prune(self):
+        """Close idle connections that have been unused for longer than `idle_timeout`."""
+        deadline = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._idle_lock:
+            while self._idle and self._idle[0][1] < deadline:
+                expired.append(self._idle.popleft()[0])
+        for stale in expired:
+            self._discard(stale)
+
+    def _reap(self):
+        while not self._stopped.wait(max(self.idle_timeout, 1)):
+            self._prune()
+
+    def _release(self, connection: smtplib.SMTP):
+        with self._idle_lock:
+            self._idle.append((connection, time.monotonic()))
+            if self._reaper is None:
+                self._stopped.clear()
+                self._reaper = threading.Thread(target=self._reap, name="smtp-pool-reaper", daemon=True)
+                self._reaper.start()
+        self._prune()
+
+    def _sendmail(self, connection: smtplib.SMTP, recipient: str, body: str):
+        """Send on `connection` and return it to the pool, closing it if the send fails."""
+        try:
+            connection.sendmail(self.username, recipient, body)
+        except Exception:
+            self._discard(connection)
+            raise
+        self._release(connection)
 
     def send_email(self, subject: str, html_content: str, recipient: str):
         try:
@@ -20,12 +107,32 @@ class SMTPClient:
             message['From'] = self.username
             message['To'] = recipient
             message.attach(MIMEText(html_content, 'html'))
+            body = message.as_string()
 
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.starttls()  # Use TLS
-                server.login(self.username, self.password)
-                server.sendmail(self.username, recipient, message.as_string())
-            logging.info(f"Email sent to {recipient}")
+            with self._slots:
+                connection = self._take_idle()
+                if connection is None:
+                    self._sendmail(self._connect(), recipient, body)
+                else:
+                    try:
+                        self._sendmail(connection, recipient, body)
+                    except (smtplib.SMTPServerDisconnected, ConnectionError):
+                        # The pooled connection went stale; retry once on a fresh one.
+                        # Other SMTPExceptions (also OSErrors) are server replies, not resent.
+                        self._sendmail(self._connect(), recipient, body)
+            logger.info("Email sent to %s", recipient)
         except Exception as e:
-            logging.error(f"Failed to send email: {str(e)}")
+            logger.error("Failed to send email: %s", e)
             raise
+
+    def close(self):
+        """Stop the reaper and close all idle pooled connections."""
+        with self._idle_lock:
+            connections = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            reaper, self._reaper = self._reaper, None
+        self._stopped.set()
+        if reaper is not None:
+            reaper.join()
+        for connection in connections:
+            self._discard(connection)
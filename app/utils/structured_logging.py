@@ -0,0 +1,128 @@
+from builtins import bool, getattr, hasattr, isinstance, str
+import atexit
+import json
+import logging
+import queue
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Id of the request being handled, set by RequestIdMiddleware and copied into every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Ids supplied by clients or proxies are reused only when they look like ids
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+class RequestIdFilter(logging.Filter):
+    """Stamps each record with the current request id (None outside a request), unless already stamped."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line: time, level, logger, message, request_id and any traceback."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Puts records on an in-process queue for a `QueueListener` thread to format and write.
+
+    The message is merged with its arguments here, before the caller can change them. Unlike
+    the stdlib handler, records are not copied or stripped of tracebacks, since they never
+    leave the process.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware that gives every HTTP request an id for log correlation.
+
+    Reuses a well-formed incoming `X-Request-ID` (so ids assigned by a proxy carry through),
+    otherwise generates one, makes it available to log records while the request is handled,
+    and returns it in the `X-Request-ID` response header.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _VALID_REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+_listener: Optional[QueueListener] = None
+
+def start_log_queue():
+    """
+    Move the root logger's handlers behind a queue, so formatting and writing log records
+    happen on a background thread instead of the event loop.
+    """
+    global _listener
+    stop_log_queue()
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    # Handler filters run in the thread that logs, where the request id is still set
+    queue_handler.addFilter(RequestIdFilter())
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def stop_log_queue():
+    """Write out every queued record, stop the listener and give the handlers back to the root logger."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, LocalQueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+
+# Records still queued at interpreter exit would otherwise be lost
+atexit.register(stop_log_queue)
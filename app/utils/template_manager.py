@@ -1,11 +1,25 @@
+import html
+import os
+import re
+import string
 import markdown2
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Stand-in for a template field while the markdown is converted; plain alphanumerics so
+# markdown leaves it untouched
+_FIELD_TOKEN = "TMPLFIELD{}X"
+_FIELD_TOKEN_RE = re.compile(r"TMPLFIELD(\d+)X")
 
 class TemplateManager:
-    def __init__(self):
+    def __init__(self, auto_reload: bool = False):
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
         self.templates_dir = self.root_dir / 'email_templates'
+        # Recompile a template when one of its files changes on disk (useful in development)
+        self.auto_reload = auto_reload
+        # template name -> (source file mtimes, compiled parts)
+        self._compiled: Dict[str, Tuple[Tuple[float, ...], List[str]]] = {}
 
     def _read_template(self, filename: str) -> str:
         """Private method to read template content."""
@@ -32,15 +46,66 @@ class TemplateManager:
                 styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return styled_html
 
-    def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context, applying advanced email styles."""
-        header = self._read_template('header.md')
-        footer = self._read_template('footer.md')
+    def _template_files(self, template_name: str) -> List[str]:
+        return ['header.md', f'{template_name}.md', 'footer.md']
+
+    def _source_mtimes(self, template_name: str) -> Tuple[float, ...]:
+        return tuple(os.stat(self.templates_dir / filename).st_mtime for filename in self._template_files(template_name))
+
+    def _compile(self, template_name: str) -> List[str]:
+        """
+        Convert a template to styled HTML once, leaving its fields as placeholders.
+
+        Returns alternating parts: even indexes are literal HTML, odd indexes are field names.
+        """
+        header, main_template, footer = (self._read_template(filename) for filename in self._template_files(template_name))
+
+        # Swap each {field} in the main template for a token that survives markdown conversion
+        field_names = []
+        main_content = []
+        for literal_text, field_name, _, _ in string.Formatter().parse(main_template):
+            main_content.append(literal_text)
+            if field_name is not None:
+                main_content.append(_FIELD_TOKEN.format(len(field_names)))
+                field_names.append(field_name)
 
-        # Read main template and format it with provided context
-        main_template = self._read_template(f'{template_name}.md')
-        main_content = main_template.format(**context)
+        full_markdown = f"{header}\n{''.join(main_content)}\n{footer}"
+        styled_html = self._apply_email_styles(markdown2.markdown(full_markdown))
 
-        full_markdown = f"{header}\n{main_content}\n{footer}"
-        html_content = markdown2.markdown(full_markdown)
-        return self._apply_email_styles(html_content)
+        parts = _FIELD_TOKEN_RE.split(styled_html)
+        for index in range(1, len(parts), 2):
+            parts[index] = field_names[int(parts[index])]
+        return parts
+
+    def _get_compiled(self, template_name: str) -> List[str]:
+        cached = self._compiled.get(template_name)
+        if cached is not None and not self.auto_reload:
+            return cached[1]
+        mtimes = self._source_mtimes(template_name)
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, self._compile(template_name))
+            self._compiled[template_name] = cached
+        return cached[1]
+
+    def preload(self, template_names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Compile templates ahead of the first email that uses them.
+
+        Defaults to every template in the templates directory; returns the names compiled.
+        """
+        if template_names is None:
+            shared = {'header.md', 'footer.md'}
+            template_names = sorted(path.stem for path in self.templates_dir.glob('*.md') if path.name not in shared)
+        template_names = list(template_names)
+        for template_name in template_names:
+            self._get_compiled(template_name)
+        return template_names
+
+    def render_template(self, template_name: str, **context) -> str:
+        """Render a markdown template with given context, applying advanced email styles."""
+        parts = self._get_compiled(template_name)
+        rendered = [
+            part if index % 2 == 0 else html.escape(str(context[part]))
+            for index, part in enumerate(parts)
+        ]
+        return ''.join(rendered)
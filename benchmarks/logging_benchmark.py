@@ -0,0 +1,106 @@
+"""
+Measure the logging cost a request pays on the event loop thread.
+
+Each simulated request logs what `/login/` logs: two INFO lines with the username and a
+DEBUG line with the user object, which is disabled at the default INFO level. Compared:
+
+- sync: the previous setup, a `StreamHandler` with the text formatter called in the
+  logging thread, with eager f-strings that format the DEBUG line although it is dropped
+- queue: the current setup, lazy %-style calls handed to a `QueueListener` thread, which
+  formats the JSON and writes it
+
+The queue numbers are the caller's share; the time for the listener to write out the
+backlog afterwards is reported separately. Writing to a local file is cheap, so the
+difference shows once writes block, as they do on a busy pipe or log collector; use
+`--sink-latency` to add that much delay to every flush.
+
+Usage:
+    python -m benchmarks.logging_benchmark --requests 20000
+    python -m benchmarks.logging_benchmark --requests 5000 --sink-latency 100
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from app.utils.structured_logging import JsonFormatter, RequestIdFilter, request_id_var, start_log_queue, stop_log_queue
+
+class SlowStream:
+    """File wrapper whose flush takes `latency` seconds longer, like a pipe with a slow reader."""
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text: str):
+        self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+        if self.latency:
+            time.sleep(self.latency)
+
+class FakeUser:
+    """Stands in for the User model, whose repr lists every column."""
+    def __init__(self, index: int):
+        self.fields = {"id": index, "email": f"user{index}@example.com", "nickname": f"user_{index}", "role": "AUTHENTICATED", "is_locked": False}
+
+    def __repr__(self):
+        return f"<User {self.fields}>"
+
+def eager_request(logger: logging.Logger, username: str, user: FakeUser):
+    logger.info(f"Checking username {username} ")
+    logger.debug(f"User : {user} ")
+    logger.info(f"Login successful for username: {username}")
+
+def lazy_request(logger: logging.Logger, username: str, user: FakeUser):
+    logger.info("Checking username %s", username)
+    logger.debug("User : %s", user)
+    logger.info("Login successful for username: %s", username)
+
+def configure(output, formatter: logging.Formatter) -> logging.Logger:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(formatter)
+    handler.addFilter(RequestIdFilter())
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return logging.getLogger("benchmark")
+
+def run(log_request, logger: logging.Logger, requests: int) -> float:
+    """Microseconds per request spent in the logging calls."""
+    user = FakeUser(1)
+    start = time.perf_counter()
+    for index in range(requests):
+        request_id_var.set(f"request-{index}")
+        log_request(logger, "user1@example.com", user)
+    return (time.perf_counter() - start) / requests * 1e6
+
+def main(requests: int, sink_latency: float):
+    with tempfile.TemporaryFile("w") as file:
+        output = SlowStream(file, sink_latency / 1e6)
+        text = logging.Formatter("%(asctime)s - %(name)s - %(request_id)s - %(levelname)s - %(message)s")
+        logger = configure(output, text)
+        sync_eager = run(eager_request, logger, requests)
+        sync_lazy = run(lazy_request, logger, requests)
+
+        logger = configure(output, JsonFormatter())
+        start_log_queue()
+        queue_lazy = run(lazy_request, logger, requests)
+        start = time.perf_counter()
+        stop_log_queue()
+        drain = (time.perf_counter() - start) * 1000
+
+    print(f"{requests} requests, 3 log calls each (1 disabled), {sink_latency:.0f} us added per write")
+    print(f"sync text, eager f-strings:  {sync_eager:8.2f} us/request")
+    print(f"sync text, lazy %-style:     {sync_lazy:8.2f} us/request")
+    print(f"queue JSON, lazy %-style:    {queue_lazy:8.2f} us/request on the caller")
+    print(f"listener backlog write-out:  {drain:8.1f} ms after the run")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sink-latency", type=float, default=0, help="microseconds added to every flush")
+    args = parser.parse_args()
+    main(args.requests, args.sink_latency)
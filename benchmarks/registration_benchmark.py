@@ -0,0 +1,119 @@
+"""
+Benchmark `UserService.create` latency and database round trips per registration.
+
+Registers N users through the service with a bounded number in flight, recording the
+wall time and the number of statements each registration sends, then prints the
+median, p99 and statement counts. Run it before and after a change to `create` to
+compare.
+
+With --seed, the users table is first filled with that many users whose nicknames are
+drawn from the generator's space (same word lists and suffix length), so nickname
+collisions happen at the rate a table of that size would cause.
+
+Usage:
+    python -m benchmarks.registration_benchmark --users 2000 --concurrency 20
+    python -m benchmarks.registration_benchmark --seed 1000000 --suffix-length 4
+
+Requires a PostgreSQL database (settings.database_url) with the application schema.
+The users and outbox entries created by the run are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import statistics
+import time
+from sqlalchemy import delete, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.email_outbox_model import EmailOutbox
+from app.models.user_model import User
+from app.services.email_service import EmailService
+from app.services.user_service import UserService
+from app.utils.nickname_gen import ADJECTIVES, NOUNS
+from app.utils.template_manager import TemplateManager
+from settings.config import settings
+
+EMAIL_PREFIX = "registration-bench-"
+statement_counter = contextvars.ContextVar("statement_counter", default=None)
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = statement_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+SEED_USERS = text("""
+    INSERT INTO users (id, nickname, email, hashed_password, role, email_verified, is_locked, is_professional, failed_login_attempts)
+    SELECT gen_random_uuid(),
+           (CAST(:adjectives AS text[]))[1 + floor(random() * :adjective_count)::int] || '-' ||
+           (CAST(:nouns AS text[]))[1 + floor(random() * :noun_count)::int] || '-' ||
+           lpad(floor(random() * :suffix_space)::bigint::text, :suffix_length, '0'),
+           :prefix || 'seed-' || g || '@example.com', 'x', 'ANONYMOUS', false, false, false, 0
+    FROM generate_series(1, :rows) AS g
+    ON CONFLICT DO NOTHING
+""")
+
+async def seed_users(engine, rows: int):
+    async with engine.begin() as conn:
+        await conn.execute(SEED_USERS, {
+            "adjectives": list(ADJECTIVES),
+            "adjective_count": len(ADJECTIVES),
+            "nouns": list(NOUNS),
+            "noun_count": len(NOUNS),
+            "suffix_space": 10 ** settings.nickname_suffix_length,
+            "suffix_length": settings.nickname_suffix_length,
+            "prefix": EMAIL_PREFIX,
+            "rows": rows,
+        })
+        await conn.execute(text("ANALYZE users"))
+
+async def register(session_factory, email_service, index: int):
+    counter = [0]
+    statement_counter.set(counter)
+    user_data = {"email": f"{EMAIL_PREFIX}{index}@example.com", "password": "Benchmark*123"}
+    async with session_factory() as session:
+        start = time.perf_counter()
+        user = await UserService.create(session, user_data, email_service)
+        elapsed = (time.perf_counter() - start) * 1000
+    if user is None:
+        raise RuntimeError(f"Registration {index} failed")
+    return elapsed, counter[0]
+
+async def main(users: int, concurrency: int, seed: int):
+    engine = create_async_engine(settings.database_url, pool_size=concurrency)
+    if seed:
+        await seed_users(engine, seed)
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Emails are only queued in the outbox; no worker runs here, so nothing is sent
+    email_service = EmailService(template_manager=TemplateManager())
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int):
+        async with semaphore:
+            return await register(session_factory, email_service, index)
+
+    try:
+        results = await asyncio.gather(*(bounded(index) for index in range(users)))
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(EmailOutbox).where(EmailOutbox.recipient.like(f"{EMAIL_PREFIX}%")))
+            await conn.execute(delete(User).where(User.email.like(f"{EMAIL_PREFIX}%")))
+        await engine.dispose()
+
+    timings = sorted(elapsed for elapsed, _ in results)
+    statements = [count for _, count in results]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{users} registrations, {concurrency} concurrent, {seed} seeded users, {settings.nickname_suffix_length}-digit nickname suffix")
+    print(f"median {statistics.median(timings):.2f} ms, p99 {p99:.2f} ms")
+    print(f"statements per registration: median {statistics.median(statements)}, max {max(statements)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0, help="users to insert before measuring")
+    parser.add_argument("--suffix-length", type=int, default=settings.nickname_suffix_length)
+    args = parser.parse_args()
+    settings.nickname_suffix_length = args.suffix_length
+    asyncio.run(main(args.users, args.concurrency, args.seed))
@@ -0,0 +1,102 @@
+"""
+Measure how throughput scales with the number of production server workers.
+
+For each worker count, starts `python -m app.serve` on a local port, drives it with
+several load-generator processes (each running many concurrent keep-alive requests
+through httpx) for a fixed duration, then stops it and prints requests per second and
+latency percentiles. The default path needs no database, so the numbers reflect the
+server and application stack rather than PostgreSQL.
+
+Usage:
+    python -m benchmarks.server_benchmark --workers 1 2 4 --duration 15
+    python -m benchmarks.server_benchmark --path /metrics/auth --clients 8 --concurrency 64
+
+Run the load generator on a machine (or CPU set) with cores to spare; otherwise it
+competes with the workers and flattens the curve.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+async def drive(url: str, concurrency: int, duration: float):
+    """Send requests to `url` from `concurrency` tasks for `duration` seconds; return latencies and errors."""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 500:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+def run_client(args):
+    return asyncio.run(drive(*args))
+
+def wait_until_ready(url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server did not become ready at {url}")
+
+def measure(workers: int, port: int, path: str, clients: int, concurrency: int, duration: float):
+    env = dict(os.environ, SERVER_BIND=f"127.0.0.1:{port}", SERVER_WORKERS=str(workers))
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}{path}"
+    try:
+        wait_until_ready(url)
+        # Warm up every worker (lazy imports, key loading) before measuring
+        run_client((url, concurrency, 2))
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(run_client, [(url, concurrency, duration)] * clients)
+    finally:
+        server.terminate()
+        server.wait()
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    if not latencies:
+        raise RuntimeError(f"No successful requests ({errors} errors)")
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / duration, statistics.median(latencies) * 1000, p99 * 1000, errors
+
+def main(worker_counts, port: int, path: str, clients: int, concurrency: int, duration: float):
+    print(f"GET {path}: {clients} client processes x {concurrency} concurrent requests, {duration:.0f}s per run")
+    baseline = None
+    for workers in worker_counts:
+        throughput, median, p99, errors = measure(workers, port, path, clients, concurrency, duration)
+        baseline = baseline or throughput
+        print(f"{workers:3d} workers: {throughput:9.0f} req/s ({throughput / baseline:4.2f}x)  median {median:7.2f} ms  p99 {p99:7.2f} ms  errors {errors}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/.well-known/jwks.json")
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent requests per client process")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per measurement")
+    args = parser.parse_args()
+    main(args.workers, args.port, args.path, args.clients, args.concurrency, args.duration)
@@ -0,0 +1,38 @@
+"""
+Compare the cost of building `Settings()` per call with the shared settings instance.
+
+Before settings were cached, every `get_settings()` call (at import time in several
+modules and once per request through FastAPI dependencies) re-read `.env` and the
+environment and re-ran pydantic validation.
+
+Usage:
+    python -m benchmarks.settings_benchmark
+"""
+
+import argparse
+import subprocess
+import sys
+import timeit
+from app.dependencies import get_settings
+from settings.config import Settings
+
+def import_time_ms(module: str, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds to import `module` in a fresh interpreter."""
+    code = f"import time; start = time.perf_counter(); import {module}; print((time.perf_counter() - start) * 1000)"
+    timings = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(repeat)]
+    return min(timings)
+
+def main(calls: int, repeat: int):
+    per_call_fresh = min(timeit.repeat(Settings, number=calls, repeat=repeat)) / calls * 1e6
+    per_call_cached = min(timeit.repeat(get_settings, number=calls, repeat=repeat)) / calls * 1e6
+    print(f"Settings() per call:     {per_call_fresh:10.2f} us")
+    print(f"get_settings() per call: {per_call_cached:10.2f} us")
+    print(f"speedup:                 {per_call_fresh / per_call_cached:10.0f}x")
+    print(f"import app.main:         {import_time_ms('app.main', repeat):10.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.calls, args.repeat)
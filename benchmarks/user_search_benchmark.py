@@ -0,0 +1,98 @@
+"""
+Benchmark nickname/email search with and without the trigram and prefix indexes.
+
+Seeds a scratch table shaped like `users` (nickname, email) with N rows, times the
+exact filters `UserService` builds for "contains" and "prefix" matches, then adds the
+same indexes the Alembic migration creates and times them again.
+
+Usage:
+    python -m benchmarks.user_search_benchmark --rows 1000000
+
+Requires a PostgreSQL database (settings.database_url) where pg_trgm can be created.
+The scratch table is dropped afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import Column, MetaData, String, Table, func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.services.user_service import UserService
+from settings.config import settings
+
+metadata = MetaData()
+bench_users = Table(
+    "users_search_bench",
+    metadata,
+    Column("nickname", String(50)),
+    Column("email", String(255)),
+)
+
+INDEXES = [
+    "CREATE INDEX ON users_search_bench USING gin (nickname gin_trgm_ops)",
+    "CREATE INDEX ON users_search_bench USING gin (email gin_trgm_ops)",
+    "CREATE INDEX ON users_search_bench (lower(nickname) text_pattern_ops)",
+    "CREATE INDEX ON users_search_bench (lower(email) text_pattern_ops)",
+]
+
+CASES = [
+    ("nickname contains", bench_users.c.nickname, "4242", "contains"),
+    ("nickname prefix", bench_users.c.nickname, "user_4242", "prefix"),
+    ("email contains", bench_users.c.email, "99999@", "contains"),
+    ("email prefix", bench_users.c.email, "person99999", "prefix"),
+]
+
+async def time_query(conn, query, repeat: int) -> float:
+    """Return the median wall time of `query` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await conn.execute(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+async def run_cases(conn, repeat: int) -> dict:
+    results = {}
+    for name, column, value, match in CASES:
+        query = select(func.count()).select_from(bench_users).where(UserService._text_match(column, value, match))
+        results[name] = await time_query(conn, query, repeat)
+    return results
+
+async def main(rows: int, repeat: int):
+    engine = create_async_engine(settings.database_url)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(text(
+            "INSERT INTO users_search_bench (nickname, email) "
+            "SELECT 'user_' || g, 'person' || g || '@example.com' FROM generate_series(1, :rows) AS g"
+        ), {"rows": rows})
+        await conn.execute(text("ANALYZE users_search_bench"))
+
+    try:
+        async with engine.connect() as conn:
+            before = await run_cases(conn, repeat)
+        async with engine.begin() as conn:
+            for statement in INDEXES:
+                await conn.execute(text(statement))
+            await conn.execute(text("ANALYZE users_search_bench"))
+        async with engine.connect() as conn:
+            after = await run_cases(conn, repeat)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+        await engine.dispose()
+
+    print(f"{rows} rows, median of {repeat} runs")
+    print(f"{'case':<20}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<20}{before[name]:>16.2f}{after[name]:>16.2f}{before[name] / after[name]:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -33,7 +33,7 @@ from faker import Faker
 from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
-from app.dependencies import get_db, get_settings
+from app.dependencies import get_db, get_login_rate_limiters, get_settings, get_user_cache
 from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
@@ -93,6 +93,14 @@ def initialize_database():
 async def setup_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Users cached by an earlier test no longer exist
+    user_cache = get_user_cache()
+    if user_cache is not None:
+        await user_cache.clear()
+    # Login attempts from earlier tests must not throttle this one
+    for limiter in get_login_rate_limiters():
+        if limiter is not None:
+            await limiter.clear()
     yield
     async with engine.begin() as conn:
         # you can comment out this line during development if you are debugging a single test
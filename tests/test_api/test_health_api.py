@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import patch
+from app.main import app
+from app.services.health_service import HealthService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def warmed_up(monkeypatch):
+    monkeypatch.setattr(app.state, "ready", True, raising=False)
+    HealthService.clear_cache()
+    yield
+    HealthService.clear_cache()
+
+
+async def test_liveness(async_client):
+    response = await async_client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+async def test_readiness_ready(async_client, warmed_up):
+    response = await async_client.get("/readyz")
+    assert response.status_code == 200
+    checks = response.json()["checks"]
+    assert checks["database"] is True
+    assert checks["email_backlog"] == 0
+
+
+async def test_readiness_caches_database_check(async_client, warmed_up):
+    await async_client.get("/readyz")
+    with patch.object(HealthService, "_query_database") as query_database:
+        response = await async_client.get("/readyz")
+    assert response.status_code == 200
+    query_database.assert_not_called()
+
+
+async def test_readiness_unready_before_warmup(async_client, warmed_up, monkeypatch):
+    monkeypatch.setattr(app.state, "ready", False)
+    response = await async_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["warmed_up"] is False
+
+
+async def test_readiness_sheds_traffic_when_pool_saturated(async_client, warmed_up):
+    with patch("app.services.health_service.Database.pool_usage", return_value=1.0), \
+         patch.object(HealthService, "_query_database") as query_database:
+        response = await async_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["pool_saturated"] is True
+    query_database.assert_not_called()
+
+
+async def test_readiness_unready_when_database_unreachable(async_client, warmed_up):
+    with patch.object(HealthService, "_query_database", side_effect=ConnectionRefusedError()):
+        response = await async_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"] is False
@@ -253,3 +253,50 @@ async def test_advanced_search_users_pagination_exceeding_total(async_client, ad
     assert len(data["items"]) == 0, "Response 'items' should be an empty list when offset exceeds total results"
     assert data["total"] >= 0, "Total users count should still be non-negative"
 
+
+@pytest.mark.asyncio
+async def test_list_users_cursor_pagination(async_client, admin_token, users_with_same_role_50_users):
+    """
+    Test that cursor mode on `/users/` returns a `next` cursor link that can be followed.
+    """
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await async_client.get("/users/?cursor=&limit=20", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 20
+    assert data["total"] is None
+    assert {link["rel"] for link in data["links"]} == {"self", "next"}
+    next_link = next(link["href"] for link in data["links"] if link["rel"] == "next")
+    assert "cursor=" in next_link
+
+    response = await async_client.get(next_link, headers=headers)
+    assert response.status_code == 200
+    assert {user["id"] for user in response.json()["items"]}.isdisjoint(user["id"] for user in data["items"])
+
+@pytest.mark.asyncio
+async def test_advanced_search_cursor_pagination_follows_next_link(async_client, admin_token, users_with_same_role_50_users):
+    """
+    Test that the `next` link of a cursor page of `/users-advanced`, POSTed with the same body, returns the second page.
+    """
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"role": "AUTHENTICATED", "cursor": "", "limit": 20}
+
+    response = await async_client.post("/users-advanced", json=payload, headers=headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 20
+    next_link = next(link["href"] for link in first_page["links"] if link["rel"] == "next")
+
+    response = await async_client.post(next_link, json=payload, headers=headers)
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["items"]) == 20
+    assert {user["id"] for user in second_page["items"]}.isdisjoint(user["id"] for user in first_page["items"])
+    assert second_page["filters"]["cursor"] != ""
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?cursor=garbage", headers=headers)
+    assert response.status_code == 400
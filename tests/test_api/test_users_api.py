@@ -5,15 +5,18 @@ from app.main import app
 from app.models.user_model import User, UserRole
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
+from app.services import jwt_service
 from app.services.jwt_service import decode_token  # Import your FastAPI app
 from pydantic import ValidationError  # Import ValidationError
 from app.services.user_service import UserService  # Import UserService
 from unittest.mock import AsyncMock, patch
 from fastapi import HTTPException
 import json
+import jwt
 from urllib.parse import urlencode
 from sqlalchemy.exc import DBAPIError
 from uuid import uuid4
+from settings.config import settings
 
 
 
@@ -127,7 +130,29 @@ async def test_login_success(async_client, verified_user):
     decoded_token = decode_token(data["access_token"])
     assert decoded_token is not None, "Failed to decode token"
     assert decoded_token["role"] == "AUTHENTICATED", "The user role should be AUTHENTICATED"
-    
+    assert data["refresh_token"]
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation_and_logout(async_client, verified_user):
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    refresh_token = response.json()["refresh_token"]
+
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert decode_token(data["access_token"])["sub"] == verified_user.email
+    assert data["refresh_token"] != refresh_token
+
+    # The rotated token cannot be used again, and reusing it revokes its successor too
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+    response = await async_client.post("/token/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 401
+
+    response = await async_client.post("/logout/", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 204
+
 @pytest.mark.asyncio
 async def test_update_user_duplicate_nickname(async_client, admin_token, user, another_user):
     """
@@ -432,3 +457,71 @@ async def test_delete_user_not_found(async_client, admin_token):
     assert response.status_code == 404, "Expected 404 for deleting a non-existent user"
 
 
+
+@pytest.mark.asyncio
+async def test_import_users_access_denied(async_client, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = await async_client.post("/users/import", json=[{"email": "x@example.com", "password": "Secure*1234"}], headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_import_users_json(async_client, admin_token, email_service):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    rows = [
+        {"email": "bulk_one@example.com", "password": "Secure*1234"},
+        {"email": "bulk_two@example.com", "password": "short"},
+    ]
+    response = await async_client.post("/users/import", json=rows, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 1
+    assert body["invalid"] == 1
+    assert [result["status"] for result in body["results"]] == ["created", "invalid"]
+
+@pytest.mark.asyncio
+async def test_import_users_csv(async_client, admin_token, email_service):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    content = "email,password,nickname\nbulk_csv@example.com,Secure*1234,\n"
+    files = {"file": ("users.csv", content, "text/csv")}
+    response = await async_client.post("/users/import/csv", files=files, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+
+@pytest.mark.asyncio
+async def test_import_users_too_many_rows(async_client, admin_token, monkeypatch):
+    monkeypatch.setattr(settings, "user_import_max_rows", 1)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    rows = [{"email": f"bulk_{i}@example.com", "password": "Secure*1234"} for i in range(2)]
+    response = await async_client.post("/users/import", json=rows, headers=headers)
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_jwks_publishes_token_signing_key(async_client, verified_user, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "jwt_algorithm", "EdDSA")
+    monkeypatch.setattr(settings, "jwt_keys_dir", str(tmp_path))
+    monkeypatch.setattr(jwt_service, "_key_ring", None)
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    access_token = response.json()["access_token"]
+
+    response = await async_client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == f"public, max-age={settings.jwks_max_age}"
+    kids = [key["kid"] for key in response.json()["keys"]]
+    assert jwt.get_unverified_header(access_token)["kid"] in kids
+
+    response = await async_client.get("/.well-known/jwks.json", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_per_email(async_client, verified_user):
+    form_data = {"username": verified_user.email, "password": "WrongPassword$1234"}
+    for _ in range(settings.login_rate_limit_per_email):
+        response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+        assert response.status_code != 429  # 401, or 400 once max_login_attempts locks the account
+
+    with patch("app.services.user_service.UserService.login_user") as login_user:
+        response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    login_user.assert_not_called()
@@ -1,3 +1,5 @@
+import smtplib
+import time
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
 from app.utils.smtp_connection import SMTPClient
@@ -28,8 +30,7 @@ async def test_smtp_client_send_email_success():
     client = SMTPClient("smtp.example.com", 587, "user@example.com", "password")
 
     with patch("smtplib.SMTP") as mock_smtp:
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp.return_value
 
         client.send_email("Test Subject", "<p>Hello</p>", "recipient@example.com")
 
@@ -37,6 +38,79 @@ async def test_smtp_client_send_email_success():
         mock_server.login.assert_called_once_with("user@example.com", "password")
         mock_server.sendmail.assert_called_once()
 
+
+def test_smtp_client_reuses_connection():
+    """Test that consecutive emails reuse one authenticated connection."""
+    client = SMTPClient("smtp.example.com", 587, "user@example.com", "password")
+
+    with patch("smtplib.SMTP") as mock_smtp:
+        client.send_email("First", "<p>1</p>", "a@example.com")
+        client.send_email("Second", "<p>2</p>", "b@example.com")
+
+        mock_smtp.assert_called_once()
+        mock_smtp.return_value.login.assert_called_once()
+        assert mock_smtp.return_value.sendmail.call_count == 2
+
+
+def test_smtp_client_reconnects_after_disconnect():
+    """Test that a pooled connection dropped by the server is replaced and the send retried."""
+    client = SMTPClient("smtp.example.com", 587, "user@example.com", "password")
+    stale, fresh = MagicMock(), MagicMock()
+    stale.sendmail.side_effect = [None, smtplib.SMTPServerDisconnected("gone")]
+
+    with patch("smtplib.SMTP", side_effect=[stale, fresh]):
+        client.send_email("First", "<p>1</p>", "a@example.com")
+        client.send_email("Second", "<p>2</p>", "b@example.com")
+
+    fresh.sendmail.assert_called_once()
+    stale.quit.assert_called_once()
+
+
+def test_smtp_client_drops_idle_connections():
+    """Test that connections idle past the timeout are closed instead of reused."""
+    client = SMTPClient("smtp.example.com", 587, "user@example.com", "password", idle_timeout=0)
+    first, second = MagicMock(), MagicMock()
+
+    with patch("smtplib.SMTP", side_effect=[first, second]):
+        client.send_email("First", "<p>1</p>", "a@example.com")
+        time.sleep(0.01)
+        client.send_email("Second", "<p>2</p>", "b@example.com")
+
+    first.quit.assert_called_once()
+    second.sendmail.assert_called_once()
+    client.close()
+    second.quit.assert_called_once()
+
+
+def test_smtp_client_does_not_resend_rejected_messages():
+    """Test that an error reply from the server is raised without resending on a new connection."""
+    client = SMTPClient("smtp.example.com", 587, "user@example.com", "password")
+    pooled = MagicMock()
+    pooled.sendmail.side_effect = [None, smtplib.SMTPRecipientsRefused({"b@example.com": (550, b"no such user")})]
+
+    with patch("smtplib.SMTP", side_effect=[pooled]) as mock_smtp:
+        client.send_email("First", "<p>1</p>", "a@example.com")
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            client.send_email("Second", "<p>2</p>", "b@example.com")
+
+    mock_smtp.assert_called_once()
+    assert pooled.sendmail.call_count == 2
+
+
+def test_smtp_client_reaps_idle_connections():
+    """Test that idle connections are closed by the reaper even when no more mail is sent."""
+    client = SMTPClient("smtp.example.com", 587, "user@example.com", "password", idle_timeout=0.05)
+    connection = MagicMock()
+
+    with patch("smtplib.SMTP", return_value=connection):
+        client.send_email("First", "<p>1</p>", "a@example.com")
+    connection.quit.assert_not_called()
+    deadline = time.monotonic() + 3
+    while not connection.quit.called and time.monotonic() < deadline:
+        time.sleep(0.05)
+    connection.quit.assert_called_once()
+    client.close()
+
 @pytest.mark.asyncio
 async def test_smtp_client_send_email_failure():
     """Test failing to send an email raises an exception."""
@@ -255,7 +329,7 @@ from app.dependencies import (
 )
 from app.services.email_service import EmailService
 from settings.config import Settings
-from app.services.jwt_service import decode_token
+from app.services.jwt_service import TokenCache, create_access_token, decode_token, token_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 @pytest.mark.asyncio
@@ -271,6 +345,7 @@ async def test_get_email_service():
     email_service = get_email_service()
     assert isinstance(email_service, EmailService)
     assert email_service.template_manager is not None
+    assert get_email_service() is email_service, "Email service should be shared across requests"
 
 
 @pytest.mark.asyncio
@@ -290,7 +365,7 @@ async def test_get_current_user_invalid():
     """Test get_current_user raises HTTPException for invalid tokens."""
     with patch("app.services.jwt_service.decode_token", return_value=None):
         with pytest.raises(HTTPException) as exc:
-            get_current_user(token="invalid_token")
+            await get_current_user(token="invalid_token")
         assert exc.value.status_code == 401
         assert "Could not validate credentials" in exc.value.detail
 
@@ -300,7 +375,7 @@ async def test_require_role_valid():
     """Test require_role allows valid roles."""
     current_user = {"user_id": "user123", "role": "ADMIN"}
     role_dependency = require_role(["ADMIN"])
-    result = role_dependency(current_user=current_user)
+    result = await role_dependency(current_user=current_user)
     assert result == current_user
 
 
@@ -310,10 +385,39 @@ async def test_require_role_invalid():
     current_user = {"user_id": "user123", "role": "USER"}
     role_dependency = require_role(["ADMIN"])
     with pytest.raises(HTTPException) as exc:
-        role_dependency(current_user=current_user)
+        await role_dependency(current_user=current_user)
     assert exc.value.status_code == 403
     assert "Operation not permitted" in exc.value.detail
 
+@pytest.mark.asyncio
+async def test_get_current_user_caches_verified_tokens():
+    """Test that a verified token is served from the token cache on later requests."""
+    token = create_access_token(data={"sub": "user123", "role": "ADMIN"})
+    token_cache.clear()
+    assert await get_current_user(token=token) == {"user_id": "user123", "role": "ADMIN"}
+    with patch("app.services.jwt_service.decode_token") as mock_decode:
+        assert await get_current_user(token=token) == {"user_id": "user123", "role": "ADMIN"}
+    mock_decode.assert_not_called()
+    assert token_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_token_cache_drops_expired_tokens():
+    """Test that cached payloads are not served past the token's expiry."""
+    cache = TokenCache(max_size=2)
+    cache.put("expired", {"sub": "user123", "exp": 1})
+    cache.put("no-expiry", {"sub": "user123"})
+    assert cache.get("expired") is None
+    assert cache.get("no-expiry") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_require_role_shares_checkers():
+    """Test that routes allowing the same roles share one role checker."""
+    assert require_role(["ADMIN", "MANAGER"]) is require_role(["MANAGER", "ADMIN"])
+    assert require_role(["ADMIN"]) is not require_role(["ADMIN", "MANAGER"])
+
 ###--------------------main tests----------------------------
 
 
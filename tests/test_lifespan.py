@@ -0,0 +1,22 @@
+# test_lifespan.py
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table
+from app.database import Base, Database
+from app.main import app, warm_up
+
+pytestmark = pytest.mark.asyncio
+
+async def test_warm_up_marks_app_ready(setup_database):
+    """Test that warmup succeeds against a migrated database and flips readiness."""
+    app.state.ready = False
+    await warm_up(app)
+    assert app.state.ready is True
+
+async def test_missing_schema_reports_tables_and_columns(setup_database):
+    """Test that the schema check names what the database lacks."""
+    assert await Database.missing_schema(Base.metadata) == []
+
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Integer, primary_key=True), Column("not_migrated", Integer))
+    Table("not_created", metadata, Column("id", Integer, primary_key=True))
+    assert sorted(await Database.missing_schema(metadata)) == ["not_created", "users.not_migrated"]
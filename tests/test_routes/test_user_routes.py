@@ -516,7 +516,6 @@ async def test_login_success(mocker):
 
     # Mock UserService methods
     mocker.patch("app.services.user_service.UserService.login_user", return_value=mock_user)
-    mocker.patch("app.services.user_service.UserService.is_account_locked", return_value=False)
     mocker.patch("app.services.jwt_service.create_access_token", return_value="mock_token")
 
     # Mock form data
@@ -539,9 +538,10 @@ async def test_restricted_login_due_to_lock(mocker):
     # Mock the session object for database interactions
     db_session_mock = AsyncMock()
 
-    # Configure the mocked behavior for the account lock check
+    # The lock is detected by login_user from the same lookup that authenticates the user
     with patch(
-        "app.services.user_service.UserService.is_account_locked", return_value=True
+        "app.services.user_service.UserService.login_user",
+        side_effect=HTTPException(status_code=400, detail="Account locked due to too many failed login attempts."),
     ) as account_lock_check_mock:
         # Simulated form data for a locked account
         locked_account_form_data = AsyncMock(username="restricted_user", password="invalid_password")
@@ -555,7 +555,7 @@ async def test_restricted_login_due_to_lock(mocker):
         assert raised_exception.value.detail == "Account locked due to too many failed login attempts.", "Incorrect error message"
 
         # Verify that the account lock check was executed as expected
-        account_lock_check_mock.assert_called_once_with(db_session_mock, "restricted_user")
+        account_lock_check_mock.assert_called_once_with(db_session_mock, "restricted_user", "invalid_password")
 
 @pytest.mark.asyncio
 async def test_authentication_with_invalid_credentials(mocker):
@@ -565,40 +565,33 @@ async def test_authentication_with_invalid_credentials(mocker):
     # Simulate a database session using an async mock
     db_session_simulation = AsyncMock()
 
-    # Mock behavior for account lock status check
+    # Mock behavior for login attempt with invalid credentials
     with patch(
-        "app.services.user_service.UserService.is_account_locked",
-        return_value=False,
-    ) as account_lock_check_mock:
-
-        # Mock behavior for login attempt with invalid credentials
-        with patch(
-            "app.services.user_service.UserService.login_user",
-            return_value=None,
-        ) as login_attempt_mock:
+        "app.services.user_service.UserService.login_user",
+        return_value=None,
+    ) as login_attempt_mock:
 
-            # Construct form data for invalid credentials
-            invalid_credentials_form = AsyncMock(
-                username="invalid_user@example.com", password="incorrect_password"
-            )
+        # Construct form data for invalid credentials
+        invalid_credentials_form = AsyncMock(
+            username="invalid_user@example.com", password="incorrect_password"
+        )
 
-            # Trigger the login function and expect an HTTP exception
-            with pytest.raises(HTTPException) as http_error:
-                await login(form_data=invalid_credentials_form, session=db_session_simulation)
+        # Trigger the login function and expect an HTTP exception
+        with pytest.raises(HTTPException) as http_error:
+            await login(form_data=invalid_credentials_form, session=db_session_simulation)
 
-            # Assertions to verify the exception details
-            assert http_error.value.status_code == 401, "Unexpected status code for invalid credentials."
-            assert http_error.value.detail == "Incorrect email or password.", "Error message does not match expected."
+        # Assertions to verify the exception details
+        assert http_error.value.status_code == 401, "Unexpected status code for invalid credentials."
+        assert http_error.value.detail == "Incorrect email or password.", "Error message does not match expected."
 
-            # Verify mocked method calls
-            account_lock_check_mock.assert_called_once_with(db_session_simulation, "invalid_user@example.com")
-            login_attempt_mock.assert_called_once_with(db_session_simulation, "invalid_user@example.com", "incorrect_password")
+        # Verify mocked method calls
+        login_attempt_mock.assert_called_once_with(db_session_simulation, "invalid_user@example.com", "incorrect_password")
             
 @pytest.mark.asyncio
 async def test_login_unexpected_error(mocker):
     """Test login failure due to an unexpected error."""
     mock_session = AsyncMock()
-    mocker.patch("app.services.user_service.UserService.is_account_locked", side_effect=Exception("Unexpected error"))
+    mocker.patch("app.services.user_service.UserService.login_user", side_effect=Exception("Unexpected error"))
 
     form_data = AsyncMock(username="test@example.com", password="password")
 
@@ -1,7 +1,11 @@
 # test_security.py
-from builtins import RuntimeError, ValueError, isinstance, str
+from builtins import RuntimeError, ValueError, isinstance, len, range, str, zip
+import asyncio
 import pytest
-from app.utils.security import hash_password, verify_password
+from fastapi import HTTPException
+from app.utils import security
+from app.utils.security import hash_password, hash_password_async, hash_passwords_async, verify_password, verify_password_async
+from settings.config import settings
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +69,57 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+@pytest.mark.asyncio
+async def test_hash_password_async_round_trip():
+    """Test that the async helpers hash and verify on the worker pool."""
+    hashed = await hash_password_async("secure_password", rounds=4)
+    assert hashed.startswith('$2b$')
+    assert await verify_password_async("secure_password", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+@pytest.mark.asyncio
+async def test_hash_password_async_rejects_when_saturated(monkeypatch):
+    """Test that a saturated hashing pool fails fast with 503 instead of queueing."""
+    monkeypatch.setattr(settings, "password_hash_max_pending", 0)
+    monkeypatch.setattr(security, "_hash_jobs_in_flight", settings.password_hash_workers)
+    with pytest.raises(HTTPException) as exc_info:
+        await hash_password_async("secure_password")
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+@pytest.mark.asyncio
+async def test_hash_password_async_does_not_count_running_jobs(monkeypatch):
+    """Test that only jobs waiting for a worker count toward the pending limit."""
+    monkeypatch.setattr(settings, "password_hash_max_pending", 1)
+    monkeypatch.setattr(security, "_hash_jobs_in_flight", settings.password_hash_workers)
+    assert (await hash_password_async("secure_password", rounds=4)).startswith('$2b$')
+    monkeypatch.setattr(security, "_hash_jobs_in_flight", settings.password_hash_workers + 1)
+    with pytest.raises(HTTPException) as exc_info:
+        await hash_password_async("secure_password", rounds=4)
+    assert exc_info.value.status_code == 503
+
+@pytest.mark.asyncio
+async def test_hash_passwords_async_preserves_order():
+    """Test that batch hashing returns one hash per password in input order."""
+    passwords = [f"secure_password_{i}" for i in range(7)]
+    hashed = await hash_passwords_async(passwords, rounds=4)
+    assert len(hashed) == len(passwords)
+    for password, hashed_password in zip(passwords, hashed):
+        assert verify_password(password, hashed_password)
+    assert await hash_passwords_async([]) == []
+
+@pytest.mark.asyncio
+async def test_verify_password_async_not_starved_by_bulk_hashing(monkeypatch):
+    """Test that a login verification gets a worker while a bulk hash is still running."""
+    monkeypatch.setattr(settings, "password_hash_workers", 2)
+    monkeypatch.setattr(security, "_hash_executor", None)
+    hashed = hash_password("secure_password", rounds=4)
+    try:
+        bulk = asyncio.create_task(hash_passwords_async([f"secure_password_{i}" for i in range(40)], rounds=8))
+        await asyncio.sleep(0.05)
+        assert await verify_password_async("secure_password", hashed) is True
+        assert not bulk.done()
+        assert len(await bulk) == 40
+    finally:
+        security.shutdown_hash_executor()
@@ -0,0 +1,20 @@
+# test_serve.py
+from app.serve import default_workers, server_options
+from settings.config import settings
+
+def test_server_options_default_to_one_worker_per_cpu(monkeypatch):
+    """Test that an unset worker count uses the available CPUs."""
+    monkeypatch.setattr(settings, "server_workers", 0)
+    options = server_options()
+    assert options["workers"] == default_workers() >= 1
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert "reload" not in options
+
+def test_server_options_follow_settings(monkeypatch):
+    """Test that worker count and recycling come from settings."""
+    monkeypatch.setattr(settings, "server_workers", 3)
+    monkeypatch.setattr(settings, "server_max_requests", 500)
+    options = server_options()
+    assert options["workers"] == 3
+    assert options["max_requests"] == 500
+    assert options["bind"] == settings.server_bind
@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy import select
+from app.database import Database
+from app.models.email_outbox_model import EmailOutbox, OutboxStatus
+from app.services.email_outbox_service import EmailOutboxWorker
+from app.services.email_service import EmailService
+from app.services.user_service import UserService
+from app.utils.nickname_gen import generate_nickname
+from app.utils.template_manager import TemplateManager
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def outbox_email_service():
+    """An EmailService spec mock that records sends but never touches SMTP."""
+    return AsyncMock(spec=EmailService)
+
+
+async def _queue_entry(db_session, email="queued@example.com"):
+    entry = EmailOutbox(
+        email_type="email_verification",
+        recipient=email,
+        payload={"name": "Queued", "verification_url": "http://example.com/verify", "email": email},
+    )
+    db_session.add(entry)
+    await db_session.commit()
+    return entry
+
+
+async def _reload(db_session, entry_id):
+    db_session.expire_all()
+    return (await db_session.execute(select(EmailOutbox).filter_by(id=entry_id))).scalars().one()
+
+
+# Test that registration writes the verification email to the outbox instead of sending it
+async def test_create_user_queues_verification_email(db_session):
+    email_service = EmailService(template_manager=TemplateManager())
+    user_data = {
+        "nickname": generate_nickname(),
+        "email": "outbox_user@example.com",
+        "password": "ValidPassword123!",
+    }
+
+    user = await UserService.create(db_session, user_data, email_service)
+
+    assert user is not None
+    entries = (await db_session.execute(select(EmailOutbox).filter_by(recipient=user.email))).scalars().all()
+    assert len(entries) == 1
+    assert entries[0].status == OutboxStatus.PENDING
+    assert str(user.id) in entries[0].payload["verification_url"]
+    assert email_service.outbox_wakeup.is_set()
+
+
+# Test that the worker delivers due entries and marks them sent
+async def test_drain_once_sends_pending_entries(db_session, outbox_email_service):
+    entry = await _queue_entry(db_session)
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory())
+
+    processed = await worker.drain_once()
+
+    assert processed == 1
+    outbox_email_service.send_user_email.assert_awaited_once_with(entry.payload, "email_verification")
+    entry = await _reload(db_session, entry.id)
+    assert entry.status == OutboxStatus.SENT
+    assert entry.sent_at is not None
+
+
+# Test that a failed delivery is rescheduled with backoff
+async def test_drain_once_retries_with_backoff(db_session, outbox_email_service):
+    entry = await _queue_entry(db_session)
+    outbox_email_service.send_user_email.side_effect = ConnectionError("SMTP down")
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory(), base_delay=30)
+
+    await worker.drain_once()
+
+    entry = await _reload(db_session, entry.id)
+    assert entry.status == OutboxStatus.PENDING
+    assert entry.attempts == 1
+    assert entry.last_error == "SMTP down"
+    assert entry.next_attempt_at > datetime.now(timezone.utc) + timedelta(seconds=20)
+
+    # Not yet due, so a second drain leaves it alone
+    assert await worker.drain_once() == 0
+
+
+# Test that an entry is marked failed once attempts are exhausted
+async def test_drain_once_gives_up_after_max_attempts(db_session, outbox_email_service):
+    entry = await _queue_entry(db_session)
+    outbox_email_service.send_user_email.side_effect = ConnectionError("SMTP down")
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory(), max_attempts=1)
+
+    await worker.drain_once()
+
+    entry = await _reload(db_session, entry.id)
+    assert entry.status == OutboxStatus.FAILED
+
+
+# Test that entries are leased and committed before sending, and each result committed as it is known
+async def test_drain_once_sends_outside_the_claim_transaction(db_session, outbox_email_service):
+    first = await _queue_entry(db_session, "first@example.com")
+    second = await _queue_entry(db_session, "second@example.com")
+    seen = []
+
+    async def send(payload, email_type):
+        # Another session can already see the claim, so no transaction or lock is held here
+        async with Database.get_session_factory()() as session:
+            rows = (await session.execute(select(EmailOutbox).order_by(EmailOutbox.recipient))).scalars().all()
+            seen.append([(row.recipient, row.status, row.attempts) for row in rows])
+            assert all(row.next_attempt_at > datetime.now(timezone.utc) for row in rows)
+
+    outbox_email_service.send_user_email.side_effect = send
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory(), lease=60)
+
+    assert await worker.drain_once() == 2
+    assert seen[0] == [("first@example.com", OutboxStatus.PENDING, 1), ("second@example.com", OutboxStatus.PENDING, 1)]
+    assert seen[1] == [("first@example.com", OutboxStatus.SENT, 1), ("second@example.com", OutboxStatus.PENDING, 1)]
+    assert (await _reload(db_session, second.id)).status == OutboxStatus.SENT
+
+
+# Test that entries whose lease ran out before their turn are left for the next claim
+async def test_drain_once_skips_entries_with_expired_lease(db_session, outbox_email_service):
+    entry = await _queue_entry(db_session)
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory(), lease=0)
+
+    await worker.drain_once()
+
+    outbox_email_service.send_user_email.assert_not_awaited()
+    entry = await _reload(db_session, entry.id)
+    assert entry.status == OutboxStatus.PENDING
+    assert entry.attempts == 1
+
+
+async def test_backoff_is_exponential_and_capped():
+    worker = EmailOutboxWorker(AsyncMock(spec=EmailService), None, base_delay=2, max_delay=10)
+    assert [worker.backoff(n).total_seconds() for n in (1, 2, 3, 4)] == [2, 4, 8, 10]
+
+
+# Test that a graceful stop lets the batch being delivered finish instead of cancelling it
+async def test_stop_waits_for_batch_in_progress(db_session, outbox_email_service):
+    entry = await _queue_entry(db_session)
+    outbox_email_service.outbox_wakeup = asyncio.Event()
+    sending = asyncio.Event()
+
+    async def slow_send(payload, email_type):
+        sending.set()
+        await asyncio.sleep(0.2)
+
+    outbox_email_service.send_user_email.side_effect = slow_send
+    worker = EmailOutboxWorker(outbox_email_service, Database.get_session_factory(), poll_interval=60)
+    worker.start()
+    await sending.wait()
+    await worker.stop(timeout=5)
+
+    entry = await _reload(db_session, entry.id)
+    assert entry.status == OutboxStatus.SENT
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.models.refresh_token_model import RefreshToken
+from app.services.refresh_token_service import RefreshTokenService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _family_tokens(db_session, user):
+    result = await db_session.execute(
+        select(RefreshToken).where(RefreshToken.user_id == user.id).execution_options(populate_existing=True)
+    )
+    return result.scalars().all()
+
+
+async def test_rotate_returns_user_and_new_token(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    rotated = await RefreshTokenService.rotate(db_session, token)
+    assert rotated is not None
+    user, new_token = rotated
+    assert user.id == verified_user.id
+    assert new_token != token
+
+    records = await _family_tokens(db_session, verified_user)
+    assert len(records) == 2
+    assert len({record.family_id for record in records}) == 1
+    old = next(record for record in records if record.revoked_at is not None)
+    assert old.replaced_by is not None
+
+
+async def test_reused_token_revokes_family(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    _, new_token = await RefreshTokenService.rotate(db_session, token)
+
+    assert await RefreshTokenService.rotate(db_session, token) is None
+    # The legitimate successor is revoked along with the rest of the family
+    assert await RefreshTokenService.rotate(db_session, new_token) is None
+    assert all(record.revoked_at is not None for record in await _family_tokens(db_session, verified_user))
+
+
+async def test_rotate_rejects_expired_token(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    record = (await _family_tokens(db_session, verified_user))[0]
+    record.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    await db_session.commit()
+    assert await RefreshTokenService.rotate(db_session, token) is None
+
+
+async def test_rotate_rejects_unknown_token(db_session):
+    assert await RefreshTokenService.rotate(db_session, "not-a-token") is None
+
+
+async def test_revoke_ends_session(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    assert await RefreshTokenService.revoke(db_session, token) is True
+    assert await RefreshTokenService.rotate(db_session, token) is None
+    assert await RefreshTokenService.revoke(db_session, "not-a-token") is False
+
+
+async def test_revoke_for_user(db_session, verified_user):
+    first = await RefreshTokenService.issue(db_session, verified_user)
+    second = await RefreshTokenService.issue(db_session, verified_user)
+    await RefreshTokenService.revoke_for_user(db_session, verified_user.id)
+    await db_session.commit()
+    assert await RefreshTokenService.rotate(db_session, first) is None
+    assert await RefreshTokenService.rotate(db_session, second) is None
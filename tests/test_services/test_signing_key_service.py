@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import jwt
+import pytest
+from app.services.signing_key_service import KeyRing
+
+
+def _key_ring(tmp_path, algorithm="EdDSA", **kwargs):
+    options = {"rotation_interval": 30 * 86400, "publish_delay": 3600, "retire_after": 900}
+    options.update(kwargs)
+    return KeyRing(str(tmp_path), algorithm, **options)
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "RS256"])
+def test_signed_token_verifies_with_published_jwk(tmp_path, algorithm):
+    key_ring = _key_ring(tmp_path, algorithm)
+    signing_key = key_ring.signing_key()
+    token = jwt.encode({"sub": "user123"}, signing_key.private_key, algorithm=algorithm, headers={"kid": signing_key.kid})
+
+    # Verify the way another service would: only from the JWK Set
+    jwks = jwt.PyJWKSet.from_dict(key_ring.jwks())
+    public_key = jwks[jwt.get_unverified_header(token)["kid"]].key
+    assert jwt.decode(token, public_key, algorithms=[algorithm])["sub"] == "user123"
+
+
+def test_concurrent_first_use_creates_one_key(tmp_path):
+    """Workers starting at the same time on an empty directory agree on a single first key."""
+    key_rings = [_key_ring(tmp_path) for _ in range(8)]
+    with ThreadPoolExecutor(len(key_rings)) as executor:
+        kids = set(executor.map(lambda key_ring: key_ring.signing_key().kid, key_rings))
+    assert len(kids) == 1
+    assert len(list(tmp_path.glob("*.pem"))) == 1
+
+
+def test_keys_are_shared_through_the_directory(tmp_path):
+    first = _key_ring(tmp_path)
+    second = _key_ring(tmp_path)
+    assert first.signing_key().kid == second.signing_key().kid
+
+
+def test_new_key_is_published_before_it_signs(tmp_path):
+    key_ring = _key_ring(tmp_path)
+    # Backdate the first key so it has been published longer than publish_delay
+    old_kid = f"{int(time.time()) - 7200}-old"
+    (tmp_path / f"{key_ring.signing_key().kid}.pem").rename(tmp_path / f"{old_kid}.pem")
+    assert key_ring.rotate(force=True) is True
+
+    assert len(key_ring.jwks()["keys"]) == 2
+    assert key_ring.signing_key().kid == old_kid
+
+
+def test_rotation_waits_for_interval(tmp_path):
+    key_ring = _key_ring(tmp_path)
+    key_ring.signing_key()
+    assert key_ring.rotate() is False
+    key_ring.rotation_interval = 0
+    assert key_ring.rotate() is True
+
+
+def test_retired_keys_are_deleted(tmp_path):
+    key_ring = _key_ring(tmp_path, publish_delay=0, retire_after=0)
+    old_kid = key_ring.signing_key().kid
+    time.sleep(1)  # kids carry whole seconds; keep the two keys ordered
+    key_ring.rotate(force=True)
+    key_ring.rotate()
+    assert key_ring.public_key(old_kid) is None
+    assert [key["kid"] for key in key_ring.jwks()["keys"]] == [key_ring.signing_key().kid]
+
+
+def test_unknown_kid_is_rejected(tmp_path):
+    assert _key_ring(tmp_path).public_key("0-unknown") is None
@@ -1,7 +1,7 @@
 from builtins import range
 import pytest
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
+from sqlalchemy import event, select
 from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
 from app.services.user_service import UserService
@@ -198,3 +198,87 @@ async def test_advanced_search_users_with_pagination(db_session, users_with_same
 
     assert total == len(users_with_same_role_50_users), "Total users should match all users"
     assert len(users) == 10, "Pagination should limit the results to 10"
+
+
+async def test_list_users_by_cursor_walks_all_pages(db_session, users_with_same_role_50_users):
+    """
+    Test that following `next` cursors visits every user exactly once, in stable order.
+    """
+    seen_ids = []
+    cursor = ""
+    while cursor is not None:
+        total, users, cursor, _ = await UserService.list_users_by_cursor(db_session, cursor, limit=15)
+        assert total is None, "Cursor pages are not counted"
+        seen_ids.extend(user.id for user in users)
+
+    assert len(seen_ids) == 50
+    assert len(set(seen_ids)) == 50
+
+
+async def test_list_users_by_cursor_prev_returns_previous_page(db_session, users_with_same_role_50_users):
+    """
+    Test that the `prev` cursor of the second page returns the first page.
+    """
+    _, first_page, next_cursor, prev_cursor = await UserService.list_users_by_cursor(db_session, "", limit=10)
+    assert prev_cursor is None, "First page should not have a prev cursor"
+
+    _, second_page, _, prev_cursor = await UserService.list_users_by_cursor(db_session, next_cursor, limit=10)
+    assert {user.id for user in second_page}.isdisjoint(user.id for user in first_page)
+
+    _, back_page, _, _ = await UserService.list_users_by_cursor(db_session, prev_cursor, limit=10)
+    assert [user.id for user in back_page] == [user.id for user in first_page]
+
+
+async def test_search_users_by_cursor_with_filters(db_session, users_with_same_role_50_users):
+    """
+    Test keyset pagination combined with search filters.
+    """
+    filters = {"role": UserRole.AUTHENTICATED.name}
+    total, users, next_cursor, prev_cursor = await UserService.search_users_by_cursor(db_session, filters, "", limit=20)
+
+    assert total is None
+    assert len(users) == 20
+    assert next_cursor is not None
+    assert prev_cursor is None
+
+
+async def test_cursor_page_is_a_single_query(db_session, users_with_same_role_50_users):
+    """
+    Test that a cursor page runs only the page query, without a separate count.
+    """
+    _, _, next_cursor, _ = await UserService.search_users_by_cursor(db_session, {}, "", limit=10)
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        await UserService.search_users_by_cursor(db_session, {"role": UserRole.AUTHENTICATED.name}, next_cursor, limit=10)
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert len(statements) == 1
+
+
+async def test_list_users_by_cursor_invalid_cursor(db_session):
+    with pytest.raises(ValueError):
+        await UserService.list_users_by_cursor(db_session, "not-a-cursor", limit=10)
+
+
+async def test_search_users_prefix_match(db_session, users_with_same_role_50_users):
+    """
+    Test that prefix matching only returns users whose nickname starts with the value.
+    """
+    target_user = users_with_same_role_50_users[0]
+    prefix = target_user.nickname[:4].upper()
+    total, users = await UserService.advanced_search_users(db_session, {"username": prefix, "match": "prefix"})
+
+    assert total > 0
+    assert all(user.nickname.lower().startswith(prefix.lower()) for user in users)
+
+
+async def test_search_users_treats_wildcards_literally(db_session, users_with_same_role_50_users):
+    """
+    Test that LIKE wildcards in the search value are matched literally.
+    """
+    total, users = await UserService.search_and_filter_users(db_session, {"username": "%"}, 0, 10)
+    assert total == 0
+    assert users == []
@@ -1,9 +1,10 @@
 
 from builtins import range
+import asyncio
 import pytest
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
-from app.dependencies import get_settings
+from sqlalchemy import event, func, select
+from app.dependencies import get_settings, get_user_cache
 from app.models.user_model import User, UserRole
 from app.services.user_service import UserService
 from app.utils.nickname_gen import generate_nickname
@@ -11,6 +12,7 @@ from datetime import datetime
 from pydantic import ValidationError  # Use this for general cases
 from pydantic_core import ValidationError as CoreValidationError  # For specific core errors
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 from unittest.mock import AsyncMock
 from app.schemas.user_schemas import UserCreate, UserUpdate
 from app.utils.security import validate_password
@@ -108,6 +110,25 @@ async def test_list_users_with_pagination(db_session, users_with_same_role_50_us
     assert len(users_page_2) == 10
     assert users_page_1[0].id != users_page_2[0].id
 
+# Test listing users together with the total count in one query
+async def test_list_users_with_count(db_session, users_with_same_role_50_users):
+    total, users = await UserService.list_users_with_count(db_session, skip=10, limit=10)
+    assert total == 50
+    assert len(users) == 10
+
+# Test that a page past the end still reports the total count
+async def test_list_users_with_count_past_last_page(db_session, users_with_same_role_50_users):
+    total, users = await UserService.list_users_with_count(db_session, skip=100, limit=10)
+    assert total == 50
+    assert users == []
+
+# Test that the estimated count falls back to an exact count on small tables
+async def test_estimated_count_small_table_is_exact(db_session, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr("app.services.user_service.settings.user_list_count_mode", "estimated")
+    total, users = await UserService.list_users_with_count(db_session, skip=0, limit=10)
+    assert total == 50
+    assert len(users) == 10
+
 # Test registering a user with valid data
 async def test_register_user_with_valid_data(db_session, email_service):
     user_data = {
@@ -643,3 +664,198 @@ async def test_unlock_user_account_invalid_user(db_session: AsyncSession):
         user_id=uuid4()  # Non-existent user ID
     )
     assert not result, "Unlocking a non-existent user account should fail"
+
+# Bulk import creates valid rows and reports the rest per row
+async def test_bulk_import_users(db_session, email_service, user):
+    rows = [
+        {"email": "import_one@example.com", "password": "ValidPassword123!"},
+        {"email": "import_two@example.com", "password": "ValidPassword123!", "nickname": "import_two"},
+        {"email": "import_one@example.com", "password": "ValidPassword123!"},
+        {"email": user.email, "password": "ValidPassword123!"},
+        {"email": "not-an-email", "password": "ValidPassword123!"},
+    ]
+    with patch("app.services.user_service.hash_passwords_async", AsyncMock(side_effect=lambda passwords: [f"hashed-{p}" for p in passwords])):
+        results = await UserService.bulk_import(db_session, rows, email_service, chunk_size=1)
+
+    assert [result["status"] for result in results] == ["created", "created", "duplicate", "duplicate", "invalid"]
+    assert [result["row"] for result in results] == [1, 2, 3, 4, 5]
+    assert "email" in results[4]["detail"]
+    created = await UserService.get_by_email(db_session, "import_two@example.com")
+    assert created.id == results[1]["id"]
+    assert created.nickname == "import_two"
+    assert created.role == UserRole.ANONYMOUS
+    assert (await UserService.get_by_email(db_session, "import_one@example.com")).nickname
+
+# Creating a user is a single statement (the outbox insert is mocked out here)
+async def test_create_user_statement_count(db_session, email_service, user):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        new_user = await UserService.create(db_session, {"email": "round_trips@example.com", "password": "ValidPassword123!"}, email_service)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    assert new_user is not None
+    assert new_user.role == UserRole.ANONYMOUS
+    assert new_user.created_at is not None
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO users")
+
+# A generated nickname that collides is replaced instead of failing the registration
+async def test_create_user_retries_generated_nickname(db_session, email_service, user):
+    with patch("app.services.user_service.generate_nickname", return_value=user.nickname), \
+         patch("app.services.user_service.generate_nicknames", return_value=[user.nickname, "fresh_nickname"]):
+        new_user = await UserService.create(db_session, {"email": "retry_nick@example.com", "password": "ValidPassword123!"}, email_service)
+    assert new_user is not None
+    assert new_user.nickname == "fresh_nickname"
+
+# Nickname candidates are checked against the table in one query per round
+async def test_allocate_nicknames_skips_taken(db_session, user):
+    with patch("app.services.user_service.generate_nicknames", side_effect=[[user.nickname, "free_one", "reserved_one"], ["free_two"]]) as generate:
+        nicknames = await UserService.allocate_nicknames(db_session, 2, reserved={"reserved_one"})
+    assert nicknames == ["free_one", "free_two"]
+    assert generate.call_count == 2
+
+# Exactly one of many simultaneous first registrations becomes ADMIN
+async def test_concurrent_first_registrations_single_admin(db_session, email_service):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+    async def register(index):
+        async with session_factory() as session:
+            return await UserService.create(session, {"email": f"first_{index}@example.com", "password": "ValidPassword123!"}, email_service)
+
+    with patch("app.services.user_service.hash_password_async", AsyncMock(return_value="hashed")):
+        created = await asyncio.gather(*(register(index) for index in range(100)))
+
+    assert all(user is not None for user in created)
+    assert [user.role for user in created].count(UserRole.ADMIN) == 1
+    admins = await db_session.execute(select(func.count()).select_from(User).where(User.role == UserRole.ADMIN))
+    assert admins.scalar() == 1
+    assert await UserService.is_first_user(db_session) is False
+
+# The bootstrap flag keeps later users from becoming ADMIN even if every user is deleted
+async def test_admin_bootstrap_flag_persists(db_session, email_service):
+    assert await UserService.is_first_user(db_session) is True
+    first = await UserService.create(db_session, {"email": "bootstrap@example.com", "password": "ValidPassword123!"}, email_service)
+    assert first.role == UserRole.ADMIN
+    await UserService.delete(db_session, first.id)
+    second = await UserService.create(db_session, {"email": "after_bootstrap@example.com", "password": "ValidPassword123!"}, email_service)
+    assert second.role == UserRole.ANONYMOUS
+
+# A registration that loses the bootstrap claim is demoted before commit
+async def test_create_user_lost_bootstrap_claim(db_session, email_service):
+    with patch.object(UserService, "_claim_admin_bootstrap", AsyncMock(return_value=False)):
+        user = await UserService.create(db_session, {"email": "lost_claim@example.com", "password": "ValidPassword123!"}, email_service)
+    persisted = await UserService.get_by_email(db_session, "lost_claim@example.com")
+    assert user.role == UserRole.ANONYMOUS
+    assert persisted.role == UserRole.ANONYMOUS
+
+# Lookups are served from the user cache once a user has been read
+async def test_get_by_email_uses_cache(db_session, user):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    async with session_factory() as session:
+        await UserService.get_by_email(session, user.email)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        async with session_factory() as session:
+            cached = await UserService.get_by_email(session, user.email)
+            by_nickname = await UserService.get_by_nickname(session, user.nickname)
+            by_id = await UserService.get_by_id(session, user.id)
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert statements == []
+    assert cached is by_nickname is by_id
+    assert cached.email == user.email
+
+# Changing a user through the service invalidates its cache entry
+async def test_unlock_invalidates_cached_user(db_session, locked_user):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        assert (await UserService.get_by_id(session, locked_user.id)).is_locked
+    assert await UserService.unlock_user_account(db_session, locked_user.id)
+    async with session_factory() as session:
+        assert not (await UserService.get_by_id(session, locked_user.id)).is_locked
+
+# An update is committed before the cached row is evicted, so other sessions read the new values
+async def test_update_invalidates_cached_user_after_commit(db_session, user):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await UserService.get_by_id(session, user.id)
+
+    assert await UserService.update(db_session, user.id, {"first_name": "Renamed"})
+
+    async with session_factory() as session:
+        assert (await UserService.get_by_id(session, user.id)).first_name == "Renamed"
+    async with session_factory() as session:
+        # Read past the cache: the change is committed, not just visible to db_session
+        assert await session.scalar(select(User.first_name).where(User.id == user.id)) == "Renamed"
+
+# Anonymizing a user evicts its cached row, so the old personal data is not served again
+async def test_anonymize_invalidates_cached_user(db_session, user):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await UserService.get_by_id(session, user.id)
+    assert await get_user_cache().get("id", user.id) is not None
+
+    anonymized = await UserService.anonymize_user(db_session, user.id)
+
+    assert await get_user_cache().get("id", user.id) is None
+    async with session_factory() as session:
+        reloaded = await UserService.get_by_id(session, user.id)
+    assert reloaded.nickname == anonymized.nickname
+    assert reloaded.nickname.startswith("Anonymous")
+
+# A repeat login within login_touch_interval with no failed attempts to clear writes nothing
+async def test_repeat_login_skips_update(db_session, verified_user):
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    first_login_at = verified_user.last_login_at
+    assert first_login_at is not None
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert not any(statement.startswith("UPDATE") for statement in statements)
+    assert verified_user.last_login_at == first_login_at
+
+# Failed attempts are still cleared, and last_login_at is recorded again once the interval has passed
+async def test_login_resets_failed_attempts_and_touches_after_interval(db_session, verified_user):
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    first_login_at = verified_user.last_login_at
+    assert await UserService.login_user(db_session, verified_user.email, "wrongpassword") is None
+    assert verified_user.failed_login_attempts == 1
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    assert verified_user.failed_login_attempts == 0
+    with patch.object(get_settings(), "login_touch_interval", 0):
+        assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    assert verified_user.last_login_at > first_login_at
+
+# Concurrent failed logins are all counted; none is lost to a read-modify-write race
+async def test_concurrent_failed_logins_are_counted_exactly(db_session, verified_user):
+    session_factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    attempts = 10
+
+    async def fail_login():
+        async with session_factory() as session:
+            return await UserService.login_user(session, verified_user.email, "wrongpassword")
+
+    with patch.object(get_settings(), "max_login_attempts", attempts):
+        results = await asyncio.gather(*(fail_login() for _ in range(attempts)))
+    assert results == [None] * attempts
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == attempts
+    assert verified_user.is_locked
+
+# A locked account is rejected from the login lookup itself
+async def test_login_locked_account_raises(db_session, locked_user):
+    with pytest.raises(HTTPException) as exc_info:
+        await UserService.login_user(db_session, locked_user.email, "MySuperPassword$1234")
+    assert exc_info.value.status_code == 400
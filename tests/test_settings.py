@@ -0,0 +1,21 @@
+# test_settings.py
+from app.dependencies import get_settings
+from settings.config import reload_settings, settings
+
+def test_get_settings_returns_shared_instance():
+    """Test that settings are loaded once and shared across calls."""
+    assert get_settings() is get_settings()
+    assert get_settings() is settings
+
+def test_reload_settings_updates_shared_instance(monkeypatch):
+    """Test that reloading re-reads the environment into the existing instance."""
+    original = settings.max_login_attempts
+    monkeypatch.setenv("MAX_LOGIN_ATTEMPTS", str(original + 5))
+    try:
+        reloaded = reload_settings()
+        assert reloaded is settings
+        assert get_settings().max_login_attempts == original + 5
+    finally:
+        monkeypatch.delenv("MAX_LOGIN_ATTEMPTS")
+        reload_settings()
+    assert settings.max_login_attempts == original
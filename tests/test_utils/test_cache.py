@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from app import dependencies
+from app.models.user_model import User, UserRole
+from app.services.user_cache_service import UserCache
+from app.utils import cache as cache_module
+from app.utils.cache import LRUCache, RedisCache
+
+
+class FakeRedis:
+    """Local stand-in for a Redis server, implementing the commands RedisCache uses."""
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+def make_user(**overrides):
+    values = dict(
+        id=uuid4(), nickname="cached_user", email="cached@example.com", role=UserRole.AUTHENTICATED,
+        hashed_password="hashed", email_verified=True, is_locked=False, failed_login_attempts=0,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+async def test_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = LRUCache(max_size=10, ttl=5)
+    await cache.set("key", {"value": 1})
+    assert await cache.get("key") == {"value": 1}
+    now[0] += 5
+    assert await cache.get("key") is None
+    assert cache.size() == 0
+
+
+async def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=60)
+    await cache.set("a", {"value": 1})
+    await cache.set("b", {"value": 2})
+    await cache.get("a")
+    await cache.set("c", {"value": 3})
+    assert await cache.get("b") is None
+    assert await cache.get("a") == {"value": 1}
+    assert await cache.get("c") == {"value": 3}
+
+
+@pytest.mark.parametrize("backend", [LRUCache(), RedisCache(FakeRedis())], ids=["memory", "redis"])
+async def test_user_cache_lookups(backend):
+    user_cache = UserCache(backend)
+    user = make_user()
+    await user_cache.put(user)
+
+    by_email = await user_cache.get("email", "cached@example.com")
+    assert by_email["id"] == user.id
+    assert by_email["role"] == UserRole.AUTHENTICATED
+    assert by_email["created_at"] == user.created_at
+    assert (await user_cache.get("nickname", "cached_user"))["email"] == user.email
+    assert (await user_cache.get("id", str(user.id)))["nickname"] == "cached_user"
+    assert await user_cache.get("email", "missing@example.com") is None
+    assert user_cache.stats()["hits"] == 3
+    assert user_cache.stats()["misses"] == 1
+
+    await user_cache.invalidate(user.id)
+    assert await user_cache.get("email", "cached@example.com") is None
+    await backend.clear()
+
+
+async def test_user_cache_ignores_stale_pointers():
+    user_cache = UserCache(LRUCache())
+    user = make_user()
+    await user_cache.put(user)
+    user.email = "changed@example.com"
+    await user_cache.put(user)
+    assert await user_cache.get("email", "cached@example.com") is None
+    assert (await user_cache.get("email", "changed@example.com"))["id"] == user.id
+
+
+def test_memory_user_cache_ttl_is_capped(monkeypatch):
+    """Other workers never see the memory backend's invalidations, so its entries must expire quickly."""
+    monkeypatch.setattr(dependencies, "_user_cache", None)
+    monkeypatch.setattr(dependencies.settings, "user_cache_backend", "memory")
+    monkeypatch.setattr(dependencies.settings, "user_cache_ttl", 300)
+    monkeypatch.setattr(dependencies.settings, "user_cache_memory_ttl", 2)
+    assert dependencies.get_user_cache().backend.ttl == 2
@@ -0,0 +1,123 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app.database import Database
+from app.utils.metrics import Counter, Histogram, HistogramFamily, Registry
+from app.utils.request_metrics import UNMATCHED_ROUTE, RequestMetricsMiddleware, request_time
+from settings.config import settings
+
+
+def test_histogram_cumulative_buckets():
+    """Observations land in the first bucket whose bound covers them and counts are cumulative."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 2}
+    assert snapshot["count"] == 3
+    assert snapshot["sum"] == pytest.approx(5.55)
+
+
+def test_histogram_reset():
+    histogram = Histogram(buckets=(1.0,))
+    histogram.observe(0.5)
+    histogram.reset()
+    assert histogram.snapshot() == {"buckets": {"1.0": 0}, "count": 0, "sum": 0.0}
+
+
+def test_pool_status_reports_pool_usage():
+    """The test database is initialized with the instrumented queue pool."""
+    status = Database.pool_status()
+    assert status["pool_class"] == "InstrumentedAsyncQueuePool"
+    for key in ("size", "checked_in", "checked_out", "overflow", "wait_seconds"):
+        assert key in status
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics_endpoint(async_client, admin_token):
+    response = await async_client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert "checked_out" in response.json()
+
+
+def test_histogram_family_reuses_children_and_renders_exposition():
+    registry = Registry()
+    family = HistogramFamily("job_seconds", "Job time.", ("kind",), buckets=(1.0,), registry=registry)
+    family.labels("a").observe(0.5)
+    family.labels("a").observe(2.0)
+    assert family.labels("a") is family.labels("a")
+
+    assert registry.render().splitlines() == [
+        "# HELP job_seconds Job time.",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{kind="a",le="1.0"} 1',
+        'job_seconds_bucket{kind="a",le="+Inf"} 2',
+        'job_seconds_sum{kind="a"} 2.5',
+        'job_seconds_count{kind="a"} 2',
+    ]
+
+
+def test_family_rejects_wrong_label_count():
+    family = HistogramFamily("job_seconds", "Job time.", ("kind",))
+    with pytest.raises(ValueError):
+        family.labels("a", "b")
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    family = HistogramFamily("job_seconds", "Job time.", ("kind",), buckets=(), registry=registry)
+    family.labels('say "hi"').observe(1)
+    assert 'job_seconds_count{kind="say \\"hi\\""} 1' in registry.render()
+
+
+def test_registry_includes_collectors():
+    registry = Registry()
+    counter = Counter()
+    counter.inc(3)
+    registry.register_collector(lambda: counter.samples("things_total"))
+    assert registry.render() == "things_total 3.0\n"
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    request_time.reset()
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+
+    assert request_time.labels("GET", "/items/{item_id}", "200").snapshot()["count"] == 2
+    assert request_time.labels("GET", UNMATCHED_ROUTE, "404").snapshot()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prometheus_metrics_endpoint(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    await async_client.get("/metrics/db-pool", headers=headers)
+    response = await async_client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/metrics/db-pool",status="200"}' in response.text
+    assert "# TYPE db_pool_wait_seconds histogram" in response.text
+    assert "# TYPE auth_duration_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoints_require_admin_or_metrics_token(async_client, user_token, monkeypatch):
+    assert (await async_client.get("/metrics")).status_code == 401
+    user_headers = {"Authorization": f"Bearer {user_token}"}
+    assert (await async_client.get("/metrics/auth", headers=user_headers)).status_code == 403
+
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    response = await async_client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert (await async_client.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
@@ -0,0 +1,19 @@
+import re
+from app.schemas.user_schemas import validate_nickname
+from app.utils.nickname_gen import generate_nickname, generate_nicknames
+from settings.config import settings
+
+def test_generate_nickname_format():
+    nickname = generate_nickname()
+    assert re.fullmatch(rf"[a-z]+-[a-z]+-\d{{{settings.nickname_suffix_length}}}", nickname)
+    assert validate_nickname(nickname) == nickname
+
+def test_generate_nickname_suffix_length_and_separator():
+    nickname = generate_nickname(separator="_", suffix_length=8)
+    assert re.fullmatch(r"[a-z]+_[a-z]+_\d{8}", nickname)
+    assert validate_nickname(nickname) == nickname
+
+def test_generate_nicknames_are_distinct():
+    nicknames = generate_nicknames(500)
+    assert len(nicknames) == 500
+    assert len(set(nicknames)) == 500
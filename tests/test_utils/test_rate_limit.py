@@ -0,0 +1,132 @@
+import pytest
+from app.utils import rate_limit
+from app.utils.rate_limit import RedisRateLimiter, TokenBucketLimiter, create_rate_limiter
+
+
+class FakeRedis:
+    """Local stand-in for a Redis server, implementing the commands RedisRateLimiter uses."""
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def ttl(self, key):
+        if key not in self.data:
+            return -2
+        return self.expiry.get(key, -1)
+
+    async def expire(self, key, seconds):
+        if key in self.data:
+            self.expiry[key] = seconds
+
+    def expire_now(self, key):
+        """Simulate the key's TTL running out."""
+        self.data.pop(key, None)
+        self.expiry.pop(key, None)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+
+    async def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+class FakePipeline:
+    """Queues commands and runs them back to back on `execute`, like MULTI/EXEC."""
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def incr(self, key):
+        self.commands.append((self.client.incr, key))
+        return self
+
+    def ttl(self, key):
+        self.commands.append((self.client.ttl, key))
+        return self
+
+    async def execute(self):
+        return [await command(key) for command, key in self.commands]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    limiter = TokenBucketLimiter(limit=3, window=60)
+    assert [await limiter.hit("1.2.3.4") for _ in range(3)] == [0, 0, 0]
+    retry_after = await limiter.hit("1.2.3.4")
+    assert 0 < retry_after <= 20
+    # Other keys have their own bucket
+    assert await limiter.hit("5.6.7.8") == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(limit=2, window=60)
+    await limiter.hit("key")
+    await limiter.hit("key")
+    assert await limiter.hit("key") == pytest.approx(30)
+    now[0] += 30
+    assert await limiter.hit("key") == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_bounds_tracked_keys():
+    limiter = TokenBucketLimiter(limit=1, window=60, max_keys=2)
+    for key in ("a", "b", "c"):
+        await limiter.hit(key)
+    assert list(limiter._buckets) == ["b", "c"]
+    await limiter.clear()
+    assert await limiter.hit("b") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_counts_per_window():
+    client = FakeRedis()
+    limiter = RedisRateLimiter(client, limit=2, window=60, prefix="test:")
+    assert await limiter.hit("user@example.com") == 0
+    assert await limiter.hit("user@example.com") == 0
+    assert await limiter.hit("user@example.com") == 60
+    assert client.expiry["test:user@example.com"] == 60
+    await limiter.clear()
+    assert client.data == {}
+
+
+def test_create_rate_limiter_disabled():
+    assert create_rate_limiter("none", limit=5, window=60, max_keys=10) is None
+    assert create_rate_limiter("memory", limit=0, window=60, max_keys=10) is None
+    assert isinstance(create_rate_limiter("memory", limit=5, window=60, max_keys=10), TokenBucketLimiter)
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_counter_never_outlives_its_window():
+    """A counter recreated after its key expired, or left without a TTL, gets a window again."""
+    client = FakeRedis()
+    limiter = RedisRateLimiter(client, limit=1, window=60, prefix="test:")
+    await limiter.hit("1.2.3.4")
+    client.expire_now("test:1.2.3.4")
+    assert await limiter.hit("1.2.3.4") == 0
+    assert client.expiry["test:1.2.3.4"] == 60
+
+    # A counter whose expiry was lost is repaired on its next hit instead of throttling forever
+    client.expiry.pop("test:1.2.3.4")
+    assert await limiter.hit("1.2.3.4") == 60
+    assert client.expiry["test:1.2.3.4"] == 60
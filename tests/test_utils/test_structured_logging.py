@@ -0,0 +1,99 @@
+import json
+import logging
+import sys
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app.utils.structured_logging import (
+    JsonFormatter,
+    LocalQueueHandler,
+    RequestIdFilter,
+    RequestIdMiddleware,
+    request_id_var,
+    start_log_queue,
+    stop_log_queue,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(msg, *args, exc_info=None):
+    return logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_json_formatter_includes_request_id_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("user %s failed", "alice", exc_info=sys.exc_info())
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "user alice failed"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["request_id"] == "req-1"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_request_id_filter_keeps_existing_id():
+    record = make_record("message")
+    record.request_id = "from-caller"
+    RequestIdFilter().filter(record)
+    assert record.request_id == "from-caller"
+
+
+def test_log_queue_writes_records_on_listener_thread():
+    root = logging.getLogger()
+    original_handlers = root.handlers[:]
+    handler = ListHandler()
+    root.handlers = [handler]
+    try:
+        start_log_queue()
+        assert isinstance(root.handlers[0], LocalQueueHandler)
+        token = request_id_var.set("req-2")
+        try:
+            logging.getLogger("app.test").warning("queued %s", "message")
+        finally:
+            request_id_var.reset(token)
+        stop_log_queue()
+
+        assert root.handlers == [handler]
+        assert [record.getMessage() for record in handler.records] == ["queued message"]
+        # Stamped where it was logged, not on the listener thread
+        assert handler.records[0].request_id == "req-2"
+    finally:
+        stop_log_queue()
+        root.handlers = original_handlers
+
+
+@pytest.mark.asyncio
+async def test_request_id_middleware_reuses_or_generates_ids():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/id")
+    async def current_id():
+        return {"request_id": request_id_var.get()}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        supplied = await client.get("/id", headers={"X-Request-ID": "proxy-42"})
+        malformed = await client.get("/id", headers={"X-Request-ID": "not an id"})
+        generated = await client.get("/id")
+
+    assert supplied.headers["x-request-id"] == "proxy-42"
+    assert supplied.json() == {"request_id": "proxy-42"}
+    assert malformed.headers["x-request-id"] != "not an id"
+    assert generated.json()["request_id"] == generated.headers["x-request-id"]
+    assert request_id_var.get() is None
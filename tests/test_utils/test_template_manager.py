@@ -0,0 +1,68 @@
+import os
+import pytest
+from unittest.mock import patch
+from app.utils.template_manager import TemplateManager
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    (tmp_path / "header.md").write_text("# Header\n", encoding="utf-8")
+    (tmp_path / "footer.md").write_text("Footer text\n", encoding="utf-8")
+    (tmp_path / "greeting.md").write_text("Hello {name}, visit [here]({url}).\n", encoding="utf-8")
+    return tmp_path
+
+
+def make_manager(templates_dir, auto_reload=False):
+    manager = TemplateManager(auto_reload=auto_reload)
+    manager.templates_dir = templates_dir
+    return manager
+
+
+def test_render_template_substitutes_fields(templates_dir):
+    manager = make_manager(templates_dir)
+    result = manager.render_template("greeting", name="Ada", url="https://example.com/verify")
+    assert "Hello Ada, visit" in result
+    assert 'href="https://example.com/verify"' in result
+    assert 'style="font-size: 24px;' in result  # Styles are applied to the compiled skeleton
+
+
+def test_render_template_escapes_values(templates_dir):
+    manager = make_manager(templates_dir)
+    result = manager.render_template("greeting", name="<b>Ada</b>", url="https://example.com/?a=1&b=2")
+    assert "&lt;b&gt;Ada&lt;/b&gt;" in result
+    assert 'href="https://example.com/?a=1&amp;b=2"' in result
+
+
+def test_render_template_compiles_once(templates_dir):
+    manager = make_manager(templates_dir)
+    with patch.object(TemplateManager, "_read_template", wraps=manager._read_template) as mock_read:
+        manager.render_template("greeting", name="Ada", url="https://example.com")
+        manager.render_template("greeting", name="Bob", url="https://example.com")
+    assert mock_read.call_count == 3  # header, template and footer, read only for the first render
+
+
+def test_render_template_missing_field(templates_dir):
+    manager = make_manager(templates_dir)
+    with pytest.raises(KeyError):
+        manager.render_template("greeting", name="Ada")
+
+
+def test_render_template_auto_reload(templates_dir):
+    manager = make_manager(templates_dir, auto_reload=True)
+    assert "Hello Ada" in manager.render_template("greeting", name="Ada", url="https://example.com")
+
+    template_path = templates_dir / "greeting.md"
+    template_path.write_text("Goodbye {name}, see [here]({url}).\n", encoding="utf-8")
+    stat = template_path.stat()
+    os.utime(template_path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert "Goodbye Ada" in manager.render_template("greeting", name="Ada", url="https://example.com")
+
+
+def test_preload_compiles_every_template(templates_dir):
+    (templates_dir / "farewell.md").write_text("Bye {name}.\n", encoding="utf-8")
+    manager = make_manager(templates_dir)
+    assert manager.preload() == ["farewell", "greeting"]
+    with patch.object(manager, "_compile") as compile_template:
+        manager.render_template("greeting", name="Ada", url="https://example.com")
+    compile_template.assert_not_called()
@@ -3,6 +3,10 @@ from starlette.datastructures import URL
 from app.utils.link_generation import generate_pagination_links
 from app.schemas.pagination_schema import PaginationLink
 from urllib.parse import urlencode
+from datetime import datetime, timezone
+from uuid import uuid4
+from app.utils.pagination import CURSOR_PREV, decode_cursor, encode_cursor
+from app.utils.pagination import generate_pagination_links as generate_cursor_aware_links
 
 # Mock Request class to simulate FastAPI's Request object
 class MockRequest:
@@ -97,4 +101,51 @@ async def test_pagination_boundary(async_client, admin_token):
     data = response.json()
     assert "items" in data, "Response should contain 'items' key"
     assert len(data["items"]) <= 1, "Only 1 item should be returned with limit=1"
-    assert data.get("total", 0) >= 1, "Total items count should be at least 1 if data exists"
\ No newline at end of file
+    assert data.get("total", 0) >= 1, "Total items count should be at least 1 if data exists"
+
+def test_cursor_round_trip():
+    """
+    Test that a keyset cursor decodes back to the position and direction it encodes.
+    """
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    user_id = uuid4()
+
+    cursor = encode_cursor(created_at, user_id, CURSOR_PREV)
+
+    assert "=" not in cursor, "Cursor should be URL-safe without padding"
+    assert decode_cursor(cursor) == (created_at, user_id, CURSOR_PREV)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(datetime.now(), uuid4())[:-4]])
+def test_decode_invalid_cursor(cursor):
+    """
+    Test that malformed cursors are rejected with a ValueError.
+    """
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_generate_cursor_pagination_links():
+    """
+    Test that cursor links replace the offset-based next/prev links.
+    """
+    request = MockRequest("http://localhost:8000", "/users?cursor=&limit=10")
+
+    links = generate_cursor_aware_links(request, 0, 10, None, next_cursor="abc", prev_cursor=None)
+    link_dict = {link.rel: str(link.href) for link in links}
+
+    assert link_dict["self"] == "http://localhost:8000/users?cursor=&limit=10"
+    assert link_dict["next"] == "http://localhost:8000/users?cursor=abc&limit=10"
+    assert "prev" not in link_dict, "Prev link should not exist without a prev cursor"
+    assert "first" not in link_dict and "last" not in link_dict, "Offset links do not apply to cursor pages"
+
+
+def test_cursor_mode_last_page_has_no_offset_links():
+    """
+    Test that a cursor page without further cursors still gets only cursor-mode links.
+    """
+    request = MockRequest("http://localhost:8000", "/users?cursor=xyz&limit=10")
+
+    links = generate_cursor_aware_links(request, 0, 10, None, cursor_mode=True)
+
+    assert [link.rel for link in links] == ["self"]